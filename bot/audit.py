@@ -0,0 +1,209 @@
+"""
+Audit Trail: wer hat wann welchen Command ausgeführt
+- Append-only SQLite-Tabelle (UPDATE per Trigger verboten, gelöscht wird nur durch die Retention)
+- Indizes auf Zeit und (User, Zeit) -> /audit Abfragen bleiben auch nach Monaten schnell
+- Schreiben über einen Hintergrund-Thread in Batches (ein Commit pro Batch, blockiert keinen Handler)
+- Vordefinierte Commands werden nur als Key gespeichert, Custom Commands mit vollem Text
+- Retention + Kompaktierung (incremental_vacuum, WAL Checkpoint) periodisch im Writer-Thread
+"""
+import re
+import time
+import queue
+import logging
+import sqlite3
+import datetime
+import threading
+
+logger = logging.getLogger(__name__)
+
+SINCE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*(s|m|min|h|d|w)$')
+SINCE_UNITS = {'s': 1, 'm': 60, 'min': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+MAX_COMMAND_CHARS = 1000
+COLUMNS = ('id', 'ts', 'user_id', 'username', 'source', 'cmd_key', 'command', 'status', 'returncode',
+           'duration_ms', 'output_bytes')
+
+
+def parse_since(text, now=None):
+    """'30m', '12h', '7d', '2w' oder ein Datum (2026-01-31) -> Unix-Zeitstempel; None wenn ungültig"""
+    text = text.strip().lower()
+    match = SINCE_RE.match(text)
+    if match:
+        return (now if now is not None else time.time()) - float(match.group(1)) * SINCE_UNITS[match.group(2)]
+    try:
+        return datetime.datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        return None
+
+
+class AuditLog:
+    """Append-only Audit Store (SQLite, WAL) mit asynchronem Batch-Writer"""
+
+    def __init__(self, path, retention_days=180, compact_interval=6 * 3600, batch_size=100):
+        self.path = path
+        self.retention_days = retention_days
+        self.compact_interval = compact_interval
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._db = self._connect()
+        self._create_schema()
+        self._last_compact = 0.0
+        self.stats = {'written': 0, 'dropped': 0, 'purged': 0}
+        self._writer = threading.Thread(target=self._write_loop, name='audit-writer', daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        # auto_vacuum muss vor dem Anlegen der ersten Tabelle gesetzt sein
+        db.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        return db
+
+    def _create_schema(self):
+        with self._lock:
+            self._db.executescript(
+                'CREATE TABLE IF NOT EXISTS audit ('
+                'id INTEGER PRIMARY KEY, ts REAL NOT NULL, user_id INTEGER, username TEXT, source TEXT, '
+                'cmd_key TEXT, command TEXT, status TEXT, returncode INTEGER, duration_ms REAL, output_bytes INTEGER);'
+                'CREATE INDEX IF NOT EXISTS audit_ts ON audit (ts);'
+                'CREATE INDEX IF NOT EXISTS audit_user_ts ON audit (user_id, ts);'
+                # Letzter bekannter Username pro User (für /audit @name ohne Full Scan)
+                'CREATE TABLE IF NOT EXISTS audit_users (user_id INTEGER PRIMARY KEY, username TEXT);'
+                'CREATE INDEX IF NOT EXISTS audit_users_name ON audit_users (username);'
+                'CREATE TRIGGER IF NOT EXISTS audit_append_only BEFORE UPDATE ON audit '
+                "BEGIN SELECT RAISE(ABORT, 'audit log is append-only'); END;"
+            )
+            self._db.commit()
+
+    def record(self, user_id, username, source, cmd_key, command=None, status='ok', returncode=None,
+               duration_ms=None, output_bytes=None):
+        """Nimmt einen Eintrag entgegen (nicht blockierend, geschrieben wird im Writer-Thread)"""
+        if command is not None:
+            command = command[:MAX_COMMAND_CHARS]
+        self._queue.put((time.time(), user_id, username, source, cmd_key, command, status, returncode,
+                         None if duration_ms is None else round(duration_ms, 1), output_bytes))
+
+    def _write_loop(self):
+        while True:
+            timeout = max(1.0, self._last_compact + self.compact_interval - time.time())
+            try:
+                items = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            # Alles, was inzwischen angekommen ist, im selben Commit schreiben
+            while items and len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write([item for item in items if isinstance(item, tuple)])
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()  # flush()
+            if None in items:
+                return
+            if time.time() - self._last_compact >= self.compact_interval:
+                self.compact()
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            with self._lock:
+                self._db.executemany(
+                    'INSERT INTO audit (ts, user_id, username, source, cmd_key, command, status, returncode, '
+                    'duration_ms, output_bytes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', batch
+                )
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO audit_users (user_id, username) VALUES (?, ?)',
+                    {(entry[1], entry[2]) for entry in batch if entry[2]}
+                )
+                self._db.commit()
+            self.stats['written'] += len(batch)
+        except sqlite3.Error as e:
+            self.stats['dropped'] += len(batch)
+            logger.error(f"❌ Audit write failed ({len(batch)} entries dropped): {e}")
+
+    def compact(self):
+        """Retention anwenden und freigewordene Seiten an das Dateisystem zurückgeben"""
+        self._last_compact = time.time()
+        if not self.retention_days:
+            return 0
+        cutoff = time.time() - self.retention_days * 86400
+        try:
+            with self._lock:
+                purged = self._db.execute('DELETE FROM audit WHERE ts < ?', (cutoff,)).rowcount
+                self._db.execute(
+                    'DELETE FROM audit_users WHERE user_id NOT IN (SELECT DISTINCT user_id FROM audit)'
+                )
+                self._db.commit()
+                if purged:
+                    # executescript läuft bis zum Ende (execute würde nur eine Seite freigeben)
+                    self._db.executescript('PRAGMA incremental_vacuum;')
+                    self._db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            self.stats['purged'] += purged
+            if purged:
+                logger.info(f"🧹 Audit log: {purged} entries older than {self.retention_days} days removed")
+            return purged
+        except sqlite3.Error as e:
+            logger.error(f"❌ Audit compaction failed: {e}")
+            return 0
+
+    def resolve_user(self, name):
+        """'@name' bzw. 'name' -> user_id (None wenn unbekannt)"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT user_id FROM audit_users WHERE username = ? COLLATE NOCASE', (name.lstrip('@'),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def query(self, user_id=None, since=None, limit=20):
+        """Neueste Einträge zuerst (nutzt audit_ts bzw. audit_user_ts)"""
+        sql = f"SELECT {', '.join(COLUMNS)} FROM audit"
+        conditions, params = [], []
+        if user_id is not None:
+            conditions.append('user_id = ?')
+            params.append(user_id)
+        if since is not None:
+            conditions.append('ts >= ?')
+            params.append(since)
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY ts DESC LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def flush(self, timeout=5.0):
+        """Wartet, bis alle bisher angenommenen Einträge geschrieben sind"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        with self._lock:
+            self._db.close()
+
+
+def format_audit(entries, title='Audit'):
+    """Eine Zeile pro Eintrag: Zeit, User, Quelle, Command, Ergebnis"""
+    if not entries:
+        return f"🧾 {title}: no entries"
+    lines = [f"🧾 {title} ({len(entries)} entries, newest first)", ""]
+    for entry in entries:
+        when = datetime.datetime.fromtimestamp(entry['ts']).strftime('%Y-%m-%d %H:%M:%S')
+        user = f"@{entry['username']}" if entry['username'] else str(entry['user_id'])
+        command = entry['cmd_key'] if not entry['command'] else f"{entry['cmd_key']}: {entry['command'][:60]}"
+        details = [entry['status']]
+        if entry['returncode'] is not None:
+            details.append(f"rc={entry['returncode']}")
+        if entry['duration_ms'] is not None:
+            details.append(f"{entry['duration_ms']:.0f}ms")
+        if entry['output_bytes'] is not None:
+            details.append(f"{entry['output_bytes']}B")
+        lines.append(f"{when} {user} [{entry['source']}] {command} ({', '.join(details)})")
+    return '\n'.join(lines)
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Benchmark für Handler-Latenz und Executor-Durchsatz
+Treibt die Bot-Handler mit synthetischen Updates gegen eine gefakte Telegram API
+und einen gefakten /host/proc Baum. Ergebnisse werden als JSON ausgegeben.
+
+Beispiel:
+    python benchmark.py --concurrency 1,4,16 --iterations 50 --output bench.json
+    python benchmark.py --baseline bench.json   # Vergleich mit früherem Lauf
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+import platform
+import subprocess
+import tempfile
+import itertools
+from collections import Counter
+
+BENCH_USER_ID = 4242
+BENCH_CHAT_ID = 4242
+
+# Inhalte für den gefakten Host-Baum (HOST_ROOT)
+FAKE_HOST_FILES = {
+    'etc/hostname': 'bench-host\n',
+    'proc/version': 'Linux version 6.1.0-bench (bench@build) (gcc 12.2.0) #1 SMP PREEMPT_DYNAMIC\n',
+    'proc/uptime': '356521.42 1402250.17\n',
+    'proc/loadavg': '0.42 0.37 0.31 2/512 12345\n',
+    'proc/cpuinfo': ''.join(
+        f'processor\t: {i}\nmodel name\t: Bench CPU @ 3.00GHz\ncpu MHz\t\t: 3000.000\n\n' for i in range(4)
+    ),
+    'proc/meminfo': (
+        'MemTotal:       16318480 kB\n'
+        'MemFree:         8123456 kB\n'
+        'MemAvailable:   12345678 kB\n'
+        'Buffers:          234567 kB\n'
+        'Cached:          3456789 kB\n'
+    ),
+    'proc/diskstats': (
+        '   8       0 sda 120034 2311 9834521 56012 98012 45012 7712034 120045 0 98012 176057 0 0 0 0 0 0\n'
+        '   8       1 sda1 119000 2300 9800000 55900 97900 45000 7700000 120000 0 97900 175900 0 0 0 0 0 0\n'
+        ' 259       0 nvme0n1 540012 0 43200960 210034 320011 0 25600880 98012 0 210045 308046 0 0 0 0 0 0\n'
+    ),
+    'proc/net/dev': (
+        'Inter-|   Receive                                                |  Transmit\n'
+        ' face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n'
+        '    lo: 1234567    8901    0    0    0     0          0         0  1234567    8901    0    0    0     0       0          0\n'
+        '  eth0: 987654321 654321   0   12    0     0          0       103 123456789 321098    0    0    0     0       0          0\n'
+    ),
+    'proc/1/mountinfo': (
+        '22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 rw\n'
+        '23 22 0:21 / /proc rw,nosuid shared:12 - proc proc rw\n'
+        '24 22 0:22 / /run rw,nosuid shared:5 - tmpfs tmpfs rw,size=1632860k\n'
+        '25 22 8:1 /srv /srv rw,relatime shared:1 - ext4 /dev/sda1 rw\n'
+    ),
+    'proc/pressure/cpu': 'some avg10=1.23 avg60=0.98 avg300=0.75 total=123456789\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=0\n',
+    'proc/pressure/io': 'some avg10=0.45 avg60=0.30 avg300=0.21 total=23456789\nfull avg10=0.20 avg60=0.15 avg300=0.10 total=12345678\n',
+    'proc/pressure/memory': 'some avg10=0.00 avg60=0.00 avg300=0.00 total=0\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=0\n',
+    'sys/class/hwmon/hwmon0/name': 'coretemp\n',
+    'sys/class/hwmon/hwmon0/temp1_input': '52000\n',
+    'sys/class/hwmon/hwmon0/temp1_label': 'Package id 0\n',
+    'sys/class/hwmon/hwmon0/temp1_max': '80000\n',
+    'sys/class/hwmon/hwmon0/temp1_crit': '100000\n',
+    'sys/class/hwmon/hwmon0/temp2_input': '49000\n',
+    'sys/class/hwmon/hwmon0/temp2_label': 'Core 0\n',
+    'sys/class/hwmon/hwmon1/name': 'nvme\n',
+    'sys/class/hwmon/hwmon1/temp1_input': '38850\n',
+    'sys/class/hwmon/hwmon1/temp1_label': 'Composite\n',
+    'sys/class/thermal/thermal_zone0/type': 'acpitz\n',
+    'sys/class/thermal/thermal_zone0/temp': '27800\n',
+    'sys/class/thermal/thermal_zone0/trip_point_0_type': 'critical\n',
+    'sys/class/thermal/thermal_zone0/trip_point_0_temp': '105000\n',
+    'sys/fs/cgroup/cgroup.controllers': 'cpuset cpu io memory pids\n',
+}
+# cgroup v2: zwei Services und ein Container unter system.slice
+for _i, _unit in enumerate(('nginx.service', 'postgresql.service', 'docker-' + 'ab12' * 16 + '.scope')):
+    _base = f'sys/fs/cgroup/system.slice/{_unit}/'
+    FAKE_HOST_FILES.update({
+        _base + 'cpu.stat': f'usage_usec {(_i + 1) * 123456789}\nuser_usec 1000\nsystem_usec 500\n',
+        _base + 'memory.current': f'{(_i + 1) * 64 * 1024 * 1024}\n',
+        _base + 'memory.stat': f'anon {(_i + 1) * 48 * 1024 * 1024}\nfile {(_i + 1) * 16 * 1024 * 1024}\n',
+        _base + 'io.stat': f'8:0 rbytes={(_i + 1) * 4096000} wbytes={(_i + 1) * 2048000} rios=1000 wios=500 dbytes=0 dios=0\n',
+        _base + 'cpu.pressure': 'some avg10=0.50 avg60=0.40 avg300=0.30 total=12345\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=0\n',
+    })
+
+
+def create_fake_host(root):
+    """Legt einen minimalen /host Baum (etc, proc, sys) unter root an"""
+    for rel_path, content in FAKE_HOST_FILES.items():
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return root
+
+
+def percentile(sorted_values, pct):
+    """Nearest-Rank Perzentil einer sortierten Liste"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, errors, wall_time):
+    """Fasst Latenzen (Sekunden) zu p50/p95/p99 und Durchsatz zusammen"""
+    values = sorted(latencies)
+    to_ms = lambda v: round(v * 1000, 3)
+    return {
+        'count': len(values),
+        'errors': errors,
+        'latency_ms': {
+            'p50': to_ms(percentile(values, 50)),
+            'p95': to_ms(percentile(values, 95)),
+            'p99': to_ms(percentile(values, 99)),
+            'mean': to_ms(sum(values) / len(values)) if values else 0.0,
+            'min': to_ms(values[0]) if values else 0.0,
+            'max': to_ms(values[-1]) if values else 0.0,
+        },
+        'wall_time_s': round(wall_time, 4),
+        'throughput_per_s': round(len(values) / wall_time, 2) if wall_time > 0 else 0.0,
+    }
+
+
+def git_revision():
+    """Aktuelle Git-Revision (für Vergleiche zwischen Versionen)"""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def build_fake_request_class():
+    """Erstellt die gefakte Telegram-API (BaseRequest ohne Netzwerk)"""
+    from telegram.request import BaseRequest
+
+    class FakeTelegramRequest(BaseRequest):
+        """Beantwortet Bot-API Calls lokal mit minimalen, gültigen Antworten"""
+
+        def __init__(self, latency=0.0):
+            self.latency = latency
+            self.calls = Counter()
+            self._message_ids = itertools.count(1000)
+
+        @property
+        def read_timeout(self):
+            return None
+
+        async def initialize(self):
+            pass
+
+        async def shutdown(self):
+            pass
+
+        def _message(self, params):
+            chat_id = params.get('chat_id', BENCH_CHAT_ID)
+            return {
+                'message_id': params.get('message_id') or next(self._message_ids),
+                'date': int(time.time()),
+                'chat': {'id': chat_id, 'type': 'private'},
+                'text': params.get('text', ''),
+            }
+
+        async def do_request(self, url, method, request_data=None, read_timeout=None,
+                             write_timeout=None, connect_timeout=None, pool_timeout=None):
+            endpoint = url.rsplit('/', 1)[-1]
+            self.calls[endpoint] += 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            params = request_data.parameters if request_data else {}
+            if endpoint == 'getMe':
+                result = {'id': 1, 'is_bot': True, 'first_name': 'Bench', 'username': 'bench_bot'}
+            elif endpoint in ('sendMessage', 'editMessageText'):
+                result = self._message(params)
+            else:
+                result = True
+            return 200, json.dumps({'ok': True, 'result': result}).encode('utf-8')
+
+    return FakeTelegramRequest
+
+
+class UpdateFactory:
+    """Erzeugt synthetische Updates für die Handler"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._ids = itertools.count(1)
+        self.user = {'id': BENCH_USER_ID, 'is_bot': False, 'first_name': 'Bench', 'username': 'bench'}
+        self.chat = {'id': BENCH_CHAT_ID, 'type': 'private'}
+
+    def _message(self, **fields):
+        message = {
+            'message_id': next(self._ids),
+            'date': int(time.time()),
+            'chat': self.chat,
+            'from': self.user,
+        }
+        message.update(fields)
+        return message
+
+    def _update(self, **fields):
+        from telegram import Update
+        data = {'update_id': next(self._ids)}
+        data.update(fields)
+        return Update.de_json(data, self.bot)
+
+    def command(self, name):
+        text = f'/{name}'
+        return self._update(message=self._message(
+            text=text, entities=[{'type': 'bot_command', 'offset': 0, 'length': len(text)}]
+        ))
+
+    def text(self, text):
+        return self._update(message=self._message(text=text))
+
+    def callback(self, data):
+        return self._update(callback_query={
+            'id': str(next(self._ids)),
+            'from': self.user,
+            'chat_instance': 'bench',
+            'data': data,
+            'message': self._message(text='menu'),
+        })
+
+    def webapp(self, payload):
+        return self._update(message=self._message(
+            web_app_data={'data': json.dumps(payload), 'button_text': '🚀 Open Control Panel'}
+        ))
+
+
+async def run_scenario(make_call, iterations, concurrency):
+    """Führt make_call() iterations-mal mit begrenzter Parallelität aus"""
+    latencies = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while next(counter) < iterations:
+            started = time.perf_counter()
+            try:
+                await make_call()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_benchmark(args, bot_module):
+    """Treibt alle Szenarien und sammelt die Ergebnisse"""
+    from telegram.ext import Application, CallbackContext
+
+    FakeTelegramRequest = build_fake_request_class()
+    fake_request = FakeTelegramRequest(latency=args.api_latency / 1000.0)
+    application = (
+        Application.builder()
+        .token(bot_module.TOKEN)
+        .request(fake_request)
+        .get_updates_request(FakeTelegramRequest())
+        .build()
+    )
+    await application.initialize()
+    factory = UpdateFactory(application.bot)
+
+    quick_data = {cmd_key: action for action, cmd_key in bot_module.QUICK_ACTIONS.items()}
+    text_data = {cmd_key: text for text, cmd_key in bot_module.TEXT_COMMANDS.items()}
+    cmd_keys = args.commands or list(bot_module.COMMANDS.keys())
+
+    def handler_call(handler, make_update):
+        async def call():
+            update = make_update()
+            await handler(update, CallbackContext.from_update(update, application))
+        return call
+
+    def executor_call(cmd_key):
+        cmd = bot_module.COMMANDS[cmd_key]
+        async def call():
+            await bot_module.run_command_async(cmd, cmd_key)
+        return call
+
+    scenarios = []
+    if not args.skip_handlers:
+        scenarios.append(('start', None, handler_call(bot_module.start, lambda: factory.command('start'))))
+        for cmd_key in cmd_keys:
+            if cmd_key in quick_data:
+                data = quick_data[cmd_key]
+                scenarios.append(('handle_quick_action', cmd_key, handler_call(
+                    bot_module.handle_quick_action, lambda data=data: factory.callback(data))))
+            if cmd_key in text_data:
+                text = text_data[cmd_key]
+                scenarios.append(('handle_text_message', cmd_key, handler_call(
+                    bot_module.handle_text_message, lambda text=text: factory.text(text))))
+            scenarios.append(('handle_webapp_data', cmd_key, handler_call(
+                bot_module.handle_webapp_data,
+                lambda cmd_key=cmd_key: factory.webapp({'command': cmd_key, 'timestamp': int(time.time() * 1000)}))))
+    if not args.skip_executor:
+        for cmd_key in cmd_keys:
+            scenarios.append(('executor', cmd_key, executor_call(cmd_key)))
+
+    results = []
+    for concurrency in args.concurrency:
+        for name, cmd_key, call in scenarios:
+            calls_before = Counter(fake_request.calls)
+            for _ in range(args.warmup):
+                await call()
+            stats = await run_scenario(call, args.iterations, concurrency)
+            api_calls = fake_request.calls - calls_before
+            stats.update({
+                'scenario': name,
+                'command': cmd_key,
+                'concurrency': concurrency,
+                'api_calls': dict(api_calls),
+            })
+            results.append(stats)
+            print(
+                f"{name:<22} {str(cmd_key or '-'):<12} c={concurrency:<3} "
+                f"p50={stats['latency_ms']['p50']:>9.2f}ms p95={stats['latency_ms']['p95']:>9.2f}ms "
+                f"p99={stats['latency_ms']['p99']:>9.2f}ms {stats['throughput_per_s']:>8.1f}/s",
+                file=sys.stderr
+            )
+
+    if bot_module.exec_worker is not None:
+        await bot_module.exec_worker.close()
+    await application.shutdown()
+    return results
+
+
+def compare_with_baseline(results, baseline_path):
+    """Ergänzt Abweichungen (%) gegenüber einem früheren JSON-Report"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {
+        (r['scenario'], r['command'], r['concurrency']): r for r in baseline.get('results', [])
+    }
+
+    def delta(new, old):
+        return round((new - old) / old * 100, 1) if old else None
+
+    for result in results:
+        old = previous.get((result['scenario'], result['command'], result['concurrency']))
+        if not old:
+            continue
+        result['delta_pct'] = {
+            pct: delta(result['latency_ms'][pct], old['latency_ms'][pct]) for pct in ('p50', 'p95', 'p99')
+        }
+        result['delta_pct']['throughput_per_s'] = delta(result['throughput_per_s'], old['throughput_per_s'])
+    return baseline.get('revision')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Heimdial Handler/Executor Benchmark')
+    parser.add_argument('--concurrency', default='1,4,16',
+                        help='Komma-separierte Parallelitätsstufen (default: 1,4,16)')
+    parser.add_argument('--iterations', type=int, default=30, help='Aufrufe pro Szenario (default: 30)')
+    parser.add_argument('--warmup', type=int, default=1, help='Warmup-Aufrufe pro Szenario (default: 1)')
+    parser.add_argument('--api-latency', type=float, default=0.0,
+                        help='Simulierte Telegram-API Latenz pro Call in ms (default: 0)')
+    parser.add_argument('--commands', default='',
+                        help='Nur diese Command-Keys (komma-separiert, default: alle)')
+    parser.add_argument('--skip-handlers', action='store_true', help='Nur Executor messen')
+    parser.add_argument('--skip-executor', action='store_true', help='Nur Handler messen')
+    parser.add_argument('--cache', action='store_true',
+                        help='Result Cache aktivieren (temporäre SQLite-Datei, default: aus)')
+    parser.add_argument('--shell-pool', action='store_true',
+                        help='Warme Shell Worker für Shell-Commands verwenden (default: neue Shell pro Command)')
+    parser.add_argument('--exec-worker', action='store_true',
+                        help='Shell-Commands im isolierten Executor-Prozess ausführen (default: im Bot-Prozess)')
+    parser.add_argument('--host-root', default=None,
+                        help='Vorhandenen Host-Baum verwenden statt eines gefakten /host/proc')
+    parser.add_argument('--baseline', default=None, help='Früherer JSON-Report zum Vergleich')
+    parser.add_argument('--output', default=None, help='JSON-Report in Datei schreiben (default: stdout)')
+    parser.add_argument('--verbose', action='store_true', help='Bot-Logs anzeigen')
+    args = parser.parse_args(argv)
+    args.concurrency = [int(c) for c in args.concurrency.split(',') if c.strip()]
+    args.commands = [c.strip() for c in args.commands.split(',') if c.strip()]
+    return args
+
+
+def main(argv=None):
+    """Main Function"""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory(prefix='heimdial-bench-') as tmp_dir:
+        host_root = args.host_root or create_fake_host(os.path.join(tmp_dir, 'host'))
+
+        # Environment muss vor dem Import von bot.py stehen (COMMANDS werden beim Import gewählt)
+        os.environ['HOST_ROOT'] = host_root
+        os.environ['DOCKER_CONTAINER'] = 'true'
+        os.environ['BOT_TOKEN'] = '123456:BENCHMARK'
+        os.environ['ALLOWED_USER_IDS'] = json.dumps([BENCH_USER_ID])
+        os.environ['WEBAPP_URL'] = 'https://example.invalid/heimdial/'
+        os.environ['CACHE_PATH'] = os.path.join(tmp_dir, 'cache.db')
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        import bot as bot_module
+
+        unknown = [c for c in args.commands if c not in bot_module.COMMANDS]
+        if unknown:
+            print(f"❌ Unknown command keys: {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        if args.cache:
+            bot_module.init_result_cache()
+        if args.exec_worker:
+            bot_module.EXEC_WORKER_ENABLED = True
+            bot_module.SHELL_POOL_ENABLED = args.shell_pool
+            bot_module.init_exec_worker()
+        if args.shell_pool:
+            bot_module.init_shell_pool()
+
+        results = asyncio.run(run_benchmark(args, bot_module))
+
+    report = {
+        'benchmark': 'heimdial',
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': f'{platform.system()} {platform.release()}',
+        'config': {
+            'concurrency': args.concurrency,
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+            'api_latency_ms': args.api_latency,
+            'host_root': args.host_root or 'fake',
+            'cache': args.cache,
+            'shell_pool': args.shell_pool,
+            'exec_worker': args.exec_worker,
+        },
+        'results': results,
+    }
+    if args.baseline:
+        report['baseline_revision'] = compare_with_baseline(results, args.baseline)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
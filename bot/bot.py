@@ -1,5 +1,6 @@
 import os
 import json
+import math
 import subprocess
 import sys
 import platform
@@ -9,10 +10,26 @@ import signal
 import atexit
 import asyncio
 import re
+import time
+import sqlite3
 from urllib.parse import quote
-from concurrent.futures import ThreadPoolExecutor
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo, KeyboardButton, ReplyKeyboardMarkup
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters, ContextTypes
+from telegram.error import BadRequest
+from outbound import build_request, ChatRateLimiter, run_with_status
+from cache import ResultCache, format_age
+from update_processor import PerChatUpdateProcessor
+from watch import WatchScheduler, parse_interval
+from follow import FollowManager, resolve_follow_path
+from shellpool import ShellPool
+from execworker import ExecWorker
+from health import collect_health, format_health
+from audit import AuditLog, parse_since, format_audit
+from selfmon import SelfMonitor, CountingExecutor, Overloaded, format_selfstats
+from collectors.iostat import IOStatCollector, format_disk_io, format_network, format_pressure
+from collectors.filesystems import FilesystemCollector, format_filesystems
+from collectors.thermal import ThermalCollector, format_thermal
+from collectors.cgroups import CgroupCollector, format_cgroups
 
 # Logging konfigurieren (wird in main() überschrieben, aber hier initialisiert)
 logging.basicConfig(level=logging.INFO)
@@ -22,16 +39,88 @@ logger = logging.getLogger(__name__)
 TOKEN = os.getenv("BOT_TOKEN")
 ALLOWED_USER_IDS = json.loads(os.getenv("ALLOWED_USER_IDS", "[]"))
 WEBAPP_URL = os.getenv("WEBAPP_URL")
+# Host-Root (im Container gemountet, siehe docker-compose.yml)
+HOST_ROOT = os.getenv("HOST_ROOT", "/host").rstrip('/') or '/'
+HOST_PROC = os.path.join(HOST_ROOT, 'proc')
+HOST_SYS = os.path.join(HOST_ROOT, 'sys')
+
+# Telegram Outbound (Connection Pools, HTTP/2, Rate Limits)
+TG_POOL_SIZE = int(os.getenv("TG_POOL_SIZE", "8"))
+TG_UPDATES_POOL_SIZE = int(os.getenv("TG_UPDATES_POOL_SIZE", "1"))
+TG_HTTP_VERSION = os.getenv("TG_HTTP_VERSION", "1.1")
+TG_CONNECT_TIMEOUT = float(os.getenv("TG_CONNECT_TIMEOUT", "5"))
+TG_READ_TIMEOUT = float(os.getenv("TG_READ_TIMEOUT", "10"))
+TG_WRITE_TIMEOUT = float(os.getenv("TG_WRITE_TIMEOUT", "10"))
+TG_RATE_LIMIT = os.getenv("TG_RATE_LIMIT", "true").lower() == "true"
+TG_MAX_RETRIES = int(os.getenv("TG_MAX_RETRIES", "3"))
+# Parallele Update-Verarbeitung (pro Chat weiterhin in Reihenfolge) und Command-Threads
+MAX_CONCURRENT_UPDATES = int(os.getenv("MAX_CONCURRENT_UPDATES", "16"))
+EXECUTOR_WORKERS = int(os.getenv("EXECUTOR_WORKERS", "4"))
+# Health Report (/health): Collectors parallel, globale Deadline in Sekunden
+HEALTH_DEADLINE = float(os.getenv("HEALTH_DEADLINE", "8"))
+HEALTH_COMMANDS = json.loads(os.getenv(
+    "HEALTH_COMMANDS",
+    '["host_info", "memory", "disk_space", "uptime", "processes", "temp", "bot_logs", "pressure"]'
+))
+# Warme Shell Worker für Shell-Commands (nur Linux/macOS)
+SHELL_POOL_ENABLED = os.getenv("SHELL_POOL_ENABLED", "true").lower() == "true"
+SHELL_POOL_MIN = int(os.getenv("SHELL_POOL_MIN", "1"))
+SHELL_POOL_MAX = int(os.getenv("SHELL_POOL_MAX", str(EXECUTOR_WORKERS)))
+SHELL_POOL_MAX_JOBS = int(os.getenv("SHELL_POOL_MAX_JOBS", "100"))
+SHELL_POOL_MAX_RSS_MB = int(os.getenv("SHELL_POOL_MAX_RSS_MB", "64"))
+SHELL_POOL_SHELL = os.getenv("SHELL_POOL_SHELL", "/bin/sh")
+# Isolierter Executor-Prozess (Linux/macOS): Shell-Commands laufen außerhalb des Bot-Prozesses
+EXEC_WORKER_ENABLED = os.getenv("EXEC_WORKER_ENABLED", "false").lower() == "true"
+EXEC_WORKER_THREADS = int(os.getenv("EXEC_WORKER_THREADS", str(EXECUTOR_WORKERS)))
+EXEC_WORKER_MAX_RSS_MB = int(os.getenv("EXEC_WORKER_MAX_RSS_MB", "256"))
+EXEC_WORKER_MAX_OUTPUT_KB = int(os.getenv("EXEC_WORKER_MAX_OUTPUT_KB", "256"))
+# Status-Nachricht ("⚙️ Running") erst senden, wenn ein Command länger als STATUS_DELAY Sekunden läuft
+STATUS_DELAY = float(os.getenv("STATUS_DELAY", "0.7"))
+
+# Result Cache (TTL pro Command, warme Einträge überleben Neustarts)
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_PATH = os.getenv("CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache.db'))
+CACHE_TTLS = json.loads(os.getenv("CACHE_TTLS", "{}"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "128"))
+
+# Selbstüberwachung (/selfstats): Soft Limits lehnen neue Commands ab, Hard Limit beendet den Bot geordnet
+SELFMON_INTERVAL = float(os.getenv("SELFMON_INTERVAL", "1"))
+SELFMON_RSS_SOFT_MB = int(os.getenv("SELFMON_RSS_SOFT_MB", "400"))
+SELFMON_RSS_HARD_MB = int(os.getenv("SELFMON_RSS_HARD_MB", "512"))
+SELFMON_LAG_SOFT_MS = float(os.getenv("SELFMON_LAG_SOFT_MS", "1000"))
+SELFMON_QUEUE_SOFT = int(os.getenv("SELFMON_QUEUE_SOFT", "32"))
+SELFMON_TRACEMALLOC = int(os.getenv("SELFMON_TRACEMALLOC", "0"))  # Frames, 0 = aus
+
+# Audit Trail (/audit [user] [since])
+AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "true").lower() == "true"
+AUDIT_PATH = os.getenv("AUDIT_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'audit.db'))
+AUDIT_RETENTION_DAYS = float(os.getenv("AUDIT_RETENTION_DAYS", "180"))
+AUDIT_LIMIT = int(os.getenv("AUDIT_LIMIT", "20"))
+
+# Watch Mode (/watch <command> <interval>)
+WATCH_DEFAULT_INTERVAL = float(os.getenv("WATCH_DEFAULT_INTERVAL", "10"))
+WATCH_MIN_INTERVAL = float(os.getenv("WATCH_MIN_INTERVAL", "2"))
+WATCH_MAX_MINUTES = float(os.getenv("WATCH_MAX_MINUTES", "30"))
+WATCH_MAX_ACTIVE = int(os.getenv("WATCH_MAX_ACTIVE", "10"))
+
+# Log Follow (/follow <pfad>) - nur Dateien unter diesen Host-Verzeichnissen
+FOLLOW_ALLOWED_PATHS = json.loads(os.getenv("FOLLOW_ALLOWED_PATHS", '["/var/log"]'))
+FOLLOW_MAX_MINUTES = float(os.getenv("FOLLOW_MAX_MINUTES", "60"))
+FOLLOW_FLUSH_INTERVAL = float(os.getenv("FOLLOW_FLUSH_INTERVAL", "3"))
+FOLLOW_BUDGET_BYTES = int(os.getenv("FOLLOW_BUDGET_BYTES", "16384"))  # pro Minute
+FOLLOW_MAX_ACTIVE = int(os.getenv("FOLLOW_MAX_ACTIVE", "5"))
 
 # Platform detection
 IS_WINDOWS = platform.system() == "Windows"
 
 # Helper class for fake subprocess result
 class FakeResult:
-    def __init__(self, stdout, stderr='', returncode=0):
+    def __init__(self, stdout, stderr='', returncode=0, data=None):
         self.stdout = stdout
         self.stderr = stderr
         self.returncode = returncode
+        # Strukturierte Daten (Native Collectors) für die Mini App
+        self.data = data
 
 def parse_disk_space(df_output):
     """Parst `df -h` Output und gibt strukturierte JSON-Daten zurück"""
@@ -96,6 +185,7 @@ def parse_disk_space(df_output):
 def get_main_menu_keyboard():
     """Erstellt das Hauptmenü mit Quick Actions als ReplyKeyboard (für WebApp)"""
     keyboard = [
+        [KeyboardButton("🩺 Health")],
         [
             KeyboardButton("🏠 Host Info"),
             KeyboardButton("🖥️ System Info")
@@ -112,14 +202,23 @@ def get_main_menu_keyboard():
             KeyboardButton("🧠 Memory"),
             KeyboardButton("📋 Bot Logs")
         ],
+        [
+            KeyboardButton("📀 Disk I/O"),
+            KeyboardButton("🌐 Network")
+        ],
+        [
+            KeyboardButton("🧯 Pressure"),
+            KeyboardButton("📦 Services")
+        ],
         # WICHTIG: KeyboardButton für WebApp (nicht InlineKeyboardButton), damit sendData funktioniert
         [KeyboardButton("🚀 Open Control Panel", web_app=WebAppInfo(url=WEBAPP_URL))]
     ]
     return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=False)
 
-def get_inline_menu_keyboard():
+def get_inline_menu_keyboard(refresh_key=None):
     """Erstellt das Hauptmenü mit Quick Actions als InlineKeyboard (für CallbackQueries)"""
     keyboard = [
+        [InlineKeyboardButton("🩺 Health", callback_data="quick_health")],
         [
             InlineKeyboardButton("🏠 Host Info", callback_data="quick_host_info"),
             InlineKeyboardButton("🖥️ System Info", callback_data="quick_system_info")
@@ -136,10 +235,36 @@ def get_inline_menu_keyboard():
             InlineKeyboardButton("🧠 Memory", callback_data="quick_memory"),
             InlineKeyboardButton("📋 Bot Logs", callback_data="quick_bot_logs")
         ],
+        [
+            InlineKeyboardButton("📀 Disk I/O", callback_data="quick_disk_io"),
+            InlineKeyboardButton("🌐 Network", callback_data="quick_network")
+        ],
+        [
+            InlineKeyboardButton("🧯 Pressure", callback_data="quick_pressure"),
+            InlineKeyboardButton("📦 Services", callback_data="quick_cgroups")
+        ],
         [InlineKeyboardButton("🚀 Open Control Panel", web_app=WebAppInfo(url=WEBAPP_URL))]
     ]
+    if refresh_key:
+        # Refresh-Button für gecachte Ergebnisse (umgeht den Cache)
+        keyboard.insert(0, [InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_{refresh_key}")])
     return InlineKeyboardMarkup(keyboard)
 
+def get_refresh_keyboard(cmd_key):
+    """InlineKeyboard mit nur dem Refresh-Button (für Antworten auf ReplyKeyboard/WebApp)"""
+    return InlineKeyboardMarkup([[InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_{cmd_key}")]])
+
+def build_webapp_link(data):
+    """Link zur Mini App mit den Daten als URL-Parameter (wird dort gerendert)"""
+    return f"{WEBAPP_URL}?data={quote(json.dumps(data, separators=(',', ':')))}"
+
+def format_cache_note(result):
+    """Hinweis auf das Alter eines gecachten Ergebnisses (leer bei frischen Ergebnissen)"""
+    cache_age = getattr(result, 'cache_age', None)
+    if cache_age is None:
+        return ""
+    return f"\n🗄️ Aus dem Cache (vor {format_age(cache_age)})"
+
 # Predefined Commands (platform-specific)
 if IS_WINDOWS:
     COMMANDS = {
@@ -155,18 +280,18 @@ if IS_WINDOWS:
 else:
     # Prüfe ob wir im Container sind und Host-Zugriff haben
     IN_CONTAINER = os.path.exists('/.dockerenv') or os.environ.get('DOCKER_CONTAINER')
-    HOST_MOUNTED = os.path.exists('/host/proc') or os.path.exists('/host')
+    HOST_MOUNTED = os.path.exists(HOST_PROC) or os.path.exists(HOST_ROOT)
     
     if IN_CONTAINER and HOST_MOUNTED:
         # Commands auf dem Host ausführen über gemountete Pfade
         COMMANDS = {
-            'host_info': 'cat /host/etc/hostname 2>/dev/null || hostname && hostname -I',
-            'system_info': 'echo "=== System Info ===" && cat /host/proc/version && echo "" && echo "Uptime:" && cat /host/proc/uptime | awk "{print int($1/86400)\" days, \"int(($1%86400)/3600)\" hours\"}" && echo "" && echo "CPU:" && grep "model name" /host/proc/cpuinfo | head -1 | cut -d: -f2 && echo "Memory:" && free -h | head -2',
-            'disk_space': 'df -h /host 2>/dev/null || df -h',
-            'uptime': 'cat /host/proc/uptime | awk "{d=int($1/86400); h=int(($1%86400)/3600); m=int(($1%3600)/60); print d\" days, \"h\" hours, \"m\" minutes\"}"',
-            'processes': 'ps aux --sort=-%cpu | head -15 || cat /host/proc/loadavg',
+            'host_info': 'cat ' + HOST_ROOT + '/etc/hostname 2>/dev/null || hostname && hostname -I',
+            'system_info': 'echo "=== System Info ===" && cat ' + HOST_PROC + '/version && echo "" && echo "Uptime:" && cat ' + HOST_PROC + '/uptime | awk "{print int($1/86400)\" days, \"int(($1%86400)/3600)\" hours\"}" && echo "" && echo "CPU:" && grep "model name" ' + HOST_PROC + '/cpuinfo | head -1 | cut -d: -f2 && echo "Memory:" && free -h | head -2',
+            'disk_space': 'df -h ' + HOST_ROOT + ' 2>/dev/null || df -h',
+            'uptime': 'cat ' + HOST_PROC + '/uptime | awk "{d=int($1/86400); h=int(($1%86400)/3600); m=int(($1%3600)/60); print d\" days, \"h\" hours, \"m\" minutes\"}"',
+            'processes': 'ps aux --sort=-%cpu | head -15 || cat ' + HOST_PROC + '/loadavg',
             'temp': 'sensors 2>/dev/null || echo "sensors not available"',
-            'memory': 'free -h || cat /host/proc/meminfo | head -5',
+            'memory': 'free -h || cat ' + HOST_PROC + '/meminfo | head -5',
             'bot_logs': 'tail -20 /app/bot/bot.log 2>/dev/null || tail -20 bot.log 2>/dev/null || echo "No log file found. Bot is running in Docker. Use: docker-compose logs bot"'
         }
     else:
@@ -182,6 +307,96 @@ else:
             'bot_logs': 'tail -20 /app/bot/bot.log 2>/dev/null || tail -20 bot.log 2>/dev/null || echo "No log file found. Bot is running in Docker. Use: docker-compose logs bot"'
         }
 
+# Native Commands: Python-Collectors lesen /proc direkt statt einen Prozess zu starten
+# key -> Funktion, die ein FakeResult (Text + strukturierte Daten) liefert
+NATIVE_COMMANDS = {}
+# key -> Funktion, die die Basis für Raten misst und die Wartezeit bis zum nächsten Sample liefert
+NATIVE_WARMUP = {}
+
+def native_result(data, formatter):
+    """Verpackt Collector-Daten als FakeResult (Text für Telegram, data für die Mini App)"""
+    return FakeResult(formatter(data), data=data)
+
+if not IS_WINDOWS:
+    COLLECTOR_PROC = HOST_PROC if os.path.exists(HOST_PROC) else '/proc'
+    io_collector = IOStatCollector(proc_root=COLLECTOR_PROC)
+    if io_collector.is_available():
+        NATIVE_COMMANDS.update({
+            'disk_io': lambda: native_result(io_collector.disk_io(), format_disk_io),
+            'network': lambda: native_result(io_collector.network(), format_network),
+            'pressure': lambda: native_result(io_collector.pressure(), format_pressure),
+        })
+        NATIVE_WARMUP.update({'disk_io': io_collector.sampler.prime, 'network': io_collector.sampler.prime})
+        # Beschreibung für "⚙️ Running" (wird nicht als Shell ausgeführt)
+        COMMANDS.update({
+            'disk_io': f'read {COLLECTOR_PROC}/diskstats',
+            'network': f'read {COLLECTOR_PROC}/net/dev',
+            'pressure': f'read {COLLECTOR_PROC}/pressure/*',
+        })
+    # disk_space: mountinfo + os.statvfs statt `df -h` (exakte Bytes, Inodes, kein Fork)
+    fs_collector = FilesystemCollector(
+        proc_root=COLLECTOR_PROC,
+        host_root=HOST_ROOT if COLLECTOR_PROC == HOST_PROC else '/',
+        network_timeout=float(os.getenv("FS_NETWORK_TIMEOUT", "2"))
+    )
+    if fs_collector.is_available():
+        NATIVE_COMMANDS['disk_space'] = lambda: native_result(fs_collector.collect(), format_filesystems)
+        COMMANDS['disk_space'] = f'statvfs ({fs_collector.mountinfo_path()})'
+    # temp: hwmon/thermal_zone aus sysfs statt `sensors` (lm-sensors ist im Container meist nicht installiert)
+    COLLECTOR_SYS = HOST_SYS if os.path.exists(HOST_SYS) else '/sys'
+    thermal_collector = ThermalCollector(sys_root=COLLECTOR_SYS)
+    if thermal_collector.is_available():
+        NATIVE_COMMANDS['temp'] = lambda: native_result(thermal_collector.collect(), format_thermal)
+        COMMANDS['temp'] = f'read {COLLECTOR_SYS}/class/{{hwmon,thermal}}'
+    # cgroups: CPU/Memory/IO pro Service und Container (cgroup v2)
+    cgroup_collector = CgroupCollector(
+        cgroup_root=os.path.join(COLLECTOR_SYS, 'fs', 'cgroup'),
+        docker_socket=os.getenv("DOCKER_SOCKET", "/var/run/docker.sock")
+    )
+    if cgroup_collector.is_available():
+        CGROUP_TOP = int(os.getenv("CGROUP_TOP", "10"))
+        NATIVE_COMMANDS['cgroups'] = lambda: native_result(cgroup_collector.top(CGROUP_TOP), format_cgroups)
+        NATIVE_WARMUP['cgroups'] = cgroup_collector.sampler.prime
+        COMMANDS['cgroups'] = f'read {cgroup_collector.cgroup_root}/*/{{cpu,memory,io}}.*'
+
+# Health Report: kein eigener Shell-Command, sondern alle HEALTH_COMMANDS parallel (siehe run_health_report)
+HEALTH_KEYS = [cmd_key for cmd_key in HEALTH_COMMANDS if cmd_key in COMMANDS]
+COMMANDS['health'] = f"health ({', '.join(HEALTH_KEYS)})"
+
+# Mappe Quick Actions (InlineKeyboard callback_data) zu Commands
+QUICK_ACTIONS = {
+    'quick_health': 'health',
+    'quick_host_info': 'host_info',
+    'quick_system_info': 'system_info',
+    'quick_disk_space': 'disk_space',
+    'quick_uptime': 'uptime',
+    'quick_processes': 'processes',
+    'quick_temp': 'temp',
+    'quick_memory': 'memory',
+    'quick_bot_logs': 'bot_logs',
+    'quick_disk_io': 'disk_io',
+    'quick_network': 'network',
+    'quick_pressure': 'pressure',
+    'quick_cgroups': 'cgroups'
+}
+
+# Mappe Button-Text (ReplyKeyboard) zu Commands
+TEXT_COMMANDS = {
+    '🩺 Health': 'health',
+    '🏠 Host Info': 'host_info',
+    '🖥️ System Info': 'system_info',
+    '💾 Disk Space': 'disk_space',
+    '🔄 Uptime': 'uptime',
+    '📈 Top Prozesse': 'processes',
+    '🌡️ Temperature': 'temp',
+    '🧠 Memory': 'memory',
+    '📋 Bot Logs': 'bot_logs',
+    '📀 Disk I/O': 'disk_io',
+    '🌐 Network': 'network',
+    '🧯 Pressure': 'pressure',
+    '📦 Services': 'cgroups'
+}
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler für /start Command"""
     logger = logging.getLogger(__name__)
@@ -316,23 +531,40 @@ async def handle_webapp_data(update: Update, context: ContextTypes.DEFAULT_TYPE)
         # Feedback an User
         logger.info(f"⚙️  Executing command '{cmd_key}' from User ID: {user_id} (@{username})")
         logger.debug(f"Command: {cmd[:100]}...")
-        await message.reply_text(f"⚙️ Running: `{cmd}`", parse_mode="Markdown", reply_markup=get_main_menu_keyboard())
-        
         # Command asynchron ausführen (blockiert Event Loop nicht)
+        # Status-Nachricht nur, wenn der Command nicht sofort fertig ist
         logger.info(f"🔄 Executing command asynchronously: {cmd_key}")
-        result = await run_command_async(cmd, cmd_key, cwd=os.path.dirname(os.path.abspath(__file__)))
+        result, _ = await run_with_status(
+            run_command_async(cmd, cmd_key, cwd=os.path.dirname(os.path.abspath(__file__)),
+                              audit=(update.effective_user, 'webapp')),
+            lambda: message.reply_text(f"⚙️ Running: `{cmd}`", parse_mode="Markdown", reply_markup=get_main_menu_keyboard()),
+            STATUS_DELAY
+        )
         
         # Output zusammenstellen
         output = result.stdout if result.stdout else result.stderr
         if not output and cmd_key == 'bot_logs':
             output = "📋 No log entries yet. Bot is running."
         
-        # Spezielle Behandlung für disk_space: JSON für WebApp, Text für Telegram
+        # Native Collectors: Text für Telegram + Link zur Visualisierung in der Mini App
+        data = getattr(result, 'data', None)
+        if data and output:
+            cache_note = format_cache_note(result)
+            await message.reply_text(
+                f"```\n{output[:3500]}\n```\n"
+                f"📊 [Visualisierung in der App öffnen]({build_webapp_link(data)}){cache_note}",
+                parse_mode="Markdown",
+                reply_markup=get_refresh_keyboard(cmd_key) if cache_note else get_main_menu_keyboard()
+            )
+            logger.info(f"✅ Command '{cmd_key}' data sent with visualization link")
+            return
+        
+        # Spezielle Behandlung für disk_space (Fallback mit `df -h`): JSON für WebApp, Text für Telegram
         if cmd_key == 'disk_space' and output:
             try:
                 # Filtere Container-spezifische Mounts heraus, wenn wir auf Host zugreifen
                 filtered_output = output
-                if os.path.exists('/host/proc'):
+                if os.path.exists(HOST_PROC):
                     # Entferne Container-Mounts aus der Ausgabe
                     lines = filtered_output.split('\n')
                     filtered_lines = [line for line in lines if not any(x in line for x in ['overlay', 'tmpfs', '/dev/shm', '/proc/', '/sys/'])]
@@ -348,12 +580,13 @@ async def handle_webapp_data(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 webapp_url_with_data = f"{WEBAPP_URL}?data={encoded_data}"
                 
                 # Sende JSON + Link zur Visualisierung
+                cache_note = format_cache_note(result)
                 await message.reply_text(
                     f"💾 **Disk Space**\n\n"
                     f"📊 [Visualisierung in der App öffnen]({webapp_url_with_data})\n\n"
-                    f"```json\n{json_data}\n```",
+                    f"```json\n{json_data}\n```{cache_note}",
                     parse_mode="Markdown",
-                    reply_markup=get_main_menu_keyboard()
+                    reply_markup=get_refresh_keyboard(cmd_key) if cache_note else get_main_menu_keyboard()
                 )
                 logger.info(f"✅ Disk space data sent as JSON ({len(disks)} disks) with visualization link")
                 return
@@ -369,81 +602,238 @@ async def handle_webapp_data(update: Update, context: ContextTypes.DEFAULT_TYPE)
         logger.info(f"✅ Command '{cmd_key}' completed successfully (output: {output_length} chars)")
         if output_length > 0:
             logger.debug(f"Command output preview: {output[:200]}...")
+        cache_note = format_cache_note(result)
         await message.reply_text(
-            f"```\n{output}\n```", 
+            f"```\n{output}\n```{cache_note}", 
             parse_mode="Markdown",
-            reply_markup=get_main_menu_keyboard()
+            reply_markup=get_refresh_keyboard(cmd_key) if cache_note else get_main_menu_keyboard()
         )
         
     except subprocess.TimeoutExpired:
         logger.warning(f"⏱️  Command '{cmd_key}' timed out after 30s from User ID: {user_id} (@{username})")
         await update.message.reply_text("❌ Timeout (>30s)", reply_markup=get_main_menu_keyboard())
+    except Overloaded as e:
+        await update.message.reply_text(str(e), reply_markup=get_main_menu_keyboard())
     except Exception as e:
         error_msg = str(e)
         logger.error(f"❌ Command '{cmd_key}' execution error from User ID: {user_id} (@{username}): {error_msg}", exc_info=True)
         await update.message.reply_text(f"❌ Error: {error_msg}", reply_markup=get_main_menu_keyboard())
 
 # Thread Pool für subprocess Commands (damit Event Loop nicht blockiert wird)
-executor = ThreadPoolExecutor(max_workers=2)
+executor = CountingExecutor(max_workers=EXECUTOR_WORKERS)
+
+# Result Cache (wird in init_result_cache() erstellt)
+result_cache = None
+shell_pool = None
+exec_worker = None
+audit_log = None
+self_monitor = None
 
-async def run_command_async(cmd, cmd_key, cwd=None):
-    """Führt einen Command asynchron aus, ohne Event Loop zu blockieren"""
+def shell_pool_config():
+    return dict(
+        min_workers=SHELL_POOL_MIN,
+        max_workers=SHELL_POOL_MAX,
+        max_jobs=SHELL_POOL_MAX_JOBS,
+        max_rss_bytes=SHELL_POOL_MAX_RSS_MB * 1024 * 1024,
+        shell=SHELL_POOL_SHELL
+    )
+
+def init_exec_worker():
+    """Richtet den isolierten Executor-Prozess ein (gestartet wird er beim ersten Command)"""
+    global exec_worker
+    if EXEC_WORKER_ENABLED and not IS_WINDOWS and exec_worker is None:
+        exec_worker = ExecWorker(
+            config={
+                'threads': EXEC_WORKER_THREADS,
+                'max_output': EXEC_WORKER_MAX_OUTPUT_KB * 1024,
+                # Die warmen Shell Worker leben dann im Executor-Prozess
+                'shell_pool': shell_pool_config() if SHELL_POOL_ENABLED else None,
+            },
+            max_rss_bytes=EXEC_WORKER_MAX_RSS_MB * 1024 * 1024
+        )
+    return exec_worker
+
+def init_shell_pool():
+    """Startet den Pool warmer Shell Worker (nicht unter Windows, nicht mit Executor-Prozess)"""
+    global shell_pool
+    if SHELL_POOL_ENABLED and not IS_WINDOWS and shell_pool is None and exec_worker is None:
+        shell_pool = ShellPool(**shell_pool_config())
+        atexit.register(shell_pool.close)
+    return shell_pool
+
+def run_shell(cmd, cwd):
+    """Führt einen Shell-Command aus: warmer Worker aus dem Pool, sonst eine neue Shell"""
+    if IS_WINDOWS:
+        return subprocess.run(
+            ['powershell', '-Command', cmd],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            cwd=cwd
+        )
+    if shell_pool is not None:
+        return shell_pool.run(cmd, cwd=cwd, timeout=30)
+    return subprocess.run(
+        cmd,
+        shell=True,
+        capture_output=True,
+        text=True,
+        timeout=30,
+        cwd=cwd
+    )
+
+def init_result_cache():
+    """Öffnet den Result Cache (Memory + SQLite), falls aktiviert"""
+    global result_cache
+    if CACHE_ENABLED and result_cache is None:
+        proc_root = HOST_PROC if os.path.exists(HOST_PROC) else '/proc'
+        result_cache = ResultCache(CACHE_PATH, proc_root=proc_root, ttls=CACHE_TTLS, max_entries=CACHE_MAX_ENTRIES)
+    return result_cache
+
+def init_audit_log():
+    """Öffnet den Audit Store, falls aktiviert"""
+    global audit_log
+    if AUDIT_ENABLED and audit_log is None:
+        try:
+            audit_log = AuditLog(AUDIT_PATH, retention_days=AUDIT_RETENTION_DAYS)
+            atexit.register(audit_log.close)
+        except sqlite3.Error as e:
+            logging.getLogger(__name__).warning(f"⚠️  Audit log unavailable ({e})")
+    return audit_log
+
+async def restart_gracefully(application):
+    """Hard Limit erreicht: Watches/Follows beenden, dann Polling stoppen -> Prozess endet, Docker startet neu"""
+    if watch_scheduler:
+        await watch_scheduler.shutdown()
+    if follow_manager:
+        await follow_manager.shutdown()
+    if exec_worker:
+        await exec_worker.close()
+    application.stop_running()
+
+def init_self_monitor():
+    """Richtet die Selbstüberwachung ein (Heartbeat und Restart-Hook kommen in post_init dazu)"""
+    global self_monitor
+    if self_monitor is None:
+        in_flight_sources = {}
+        if exec_worker is not None:
+            in_flight_sources['exec worker'] = lambda: exec_worker.in_flight
+        self_monitor = SelfMonitor(
+            executor=executor,
+            interval=SELFMON_INTERVAL,
+            rss_soft_bytes=SELFMON_RSS_SOFT_MB * 1024 * 1024,
+            rss_hard_bytes=SELFMON_RSS_HARD_MB * 1024 * 1024,
+            lag_soft_ms=SELFMON_LAG_SOFT_MS,
+            queue_soft=SELFMON_QUEUE_SOFT,
+            tracemalloc_frames=SELFMON_TRACEMALLOC,
+            in_flight_sources=in_flight_sources
+        )
+    return self_monitor
+
+def audit_event(user, source, cmd_key, command=None, status='ok'):
+    """Audit-Eintrag ohne Command-Ausführung (z.B. Start eines Watches)"""
+    if audit_log is not None:
+        audit_log.record(user.id, user.username, source, cmd_key, command, status)
+
+async def run_audited(cmd, cmd_key, cwd, use_cache, user, source):
+    """run_command_async + Audit-Eintrag (Exit Code, Dauer, Ausgabegröße), auch bei Fehlern"""
+    started = time.monotonic()
+    status, result = 'error', None
+    try:
+        result = await run_command_async(cmd, cmd_key, cwd=cwd, use_cache=use_cache)
+        if hasattr(result, 'cache_age'):
+            status = 'cached'
+        else:
+            status = 'ok' if result.returncode in (0, None) else 'failed'
+        return result
+    except subprocess.TimeoutExpired:
+        status = 'timeout'
+        raise
+    finally:
+        output_bytes = None
+        if result is not None:
+            output_bytes = sum(len((text or '').encode('utf-8', errors='replace')) for text in (result.stdout, result.stderr))
+        audit_log.record(
+            user.id, user.username, source, cmd_key,
+            # Vordefinierte Commands nur als Key, Custom Commands mit Text
+            command=cmd if COMMANDS.get(cmd_key) != cmd else None,
+            status=status,
+            returncode=getattr(result, 'returncode', None),
+            duration_ms=(time.monotonic() - started) * 1000,
+            output_bytes=output_bytes
+        )
+
+async def run_health_report(cwd=None):
+    """Führt alle HEALTH_KEYS parallel aus und fasst sie zu einem Report zusammen (Text + data)"""
+    async def run(cmd_key):
+        result = await run_command_async(COMMANDS[cmd_key], cmd_key, cwd=cwd)
+        if cmd_key == 'disk_space' and getattr(result, 'data', None) is None and result.stdout:
+            # Fallback `df -h`: für die Bewertung in strukturierte Daten umwandeln
+            result = FakeResult(result.stdout, result.stderr, result.returncode,
+                                data={'type': 'disk_space', 'disks': parse_disk_space(result.stdout)})
+        return result
+    
+    extra_items = [self_monitor.health_item()] if self_monitor is not None else []
+    report = await collect_health(run, HEALTH_KEYS, HEALTH_DEADLINE, extra_items)
+    if self_monitor is not None:
+        report['bot'] = self_monitor.snapshot()
+    return FakeResult(format_health(report), data=report)
+
+async def run_command_async(cmd, cmd_key, cwd=None, use_cache=True, audit=None):
+    """Führt einen Command asynchron aus, ohne Event Loop zu blockieren (audit=(user, source) protokolliert)"""
     logger = logging.getLogger(__name__)
     loop = asyncio.get_event_loop()
     
+    # Load Shedding nur für Commands von Usern (Watches und Teil-Commands von /health laufen weiter)
+    if audit is not None and self_monitor is not None:
+        reason = self_monitor.overloaded()
+        if reason:
+            logger.warning(f"⏳ Rejected '{cmd_key}': {reason}")
+            audit_event(audit[0], audit[1], cmd_key, cmd if COMMANDS.get(cmd_key) != cmd else None, status='rejected')
+            raise Overloaded(f"⏳ Bot ausgelastet ({reason}), bitte später erneut versuchen")
+    
+    if audit is not None and audit_log is not None:
+        return await run_audited(cmd, cmd_key, cwd, use_cache, *audit)
+    
+    if cmd_key == 'health' and cmd == COMMANDS['health']:
+        return await run_health_report(cwd)
+    
+    # Nur vordefinierte Commands mit TTL werden gecacht (nie Custom Commands)
+    cacheable = result_cache is not None and COMMANDS.get(cmd_key) == cmd and result_cache.is_cacheable(cmd_key)
+    if cacheable and use_cache:
+        cached = result_cache.get(cmd_key, cmd)
+        if cached is not None:
+            logger.info(f"🗄️  Cache hit for '{cmd_key}' (age: {format_age(cached.cache_age)})")
+            return cached
+    
+    docker_logs = cmd_key == 'bot_logs' and (os.path.exists('/.dockerenv') or os.environ.get('DOCKER_CONTAINER'))
+    if exec_worker is not None and cmd_key not in NATIVE_COMMANDS and not docker_logs:
+        # Shell-Command im Executor-Prozess: der Event Loop wartet nur auf den Socket
+        result = await exec_worker.run(cmd, cwd or os.path.dirname(os.path.abspath(__file__)), timeout=30)
+        if cacheable:
+            await loop.run_in_executor(executor, result_cache.put, cmd_key, cmd, result)
+        return result
+    
     def run_subprocess():
         try:
-            if cmd_key == 'bot_logs':
-                if os.path.exists('/.dockerenv') or os.environ.get('DOCKER_CONTAINER'):
-                    log_paths = ['/app/bot/bot.log', 'bot.log', '/app/logs/bot.log']
-                    output = None
-                    for log_path in log_paths:
-                        if os.path.exists(log_path):
-                            try:
-                                with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                    lines = f.readlines()
-                                    output = ''.join(lines[-20:]) if len(lines) > 20 else ''.join(lines)
-                                    break
-                            except:
-                                continue
-                    if not output:
-                        output = '📋 Bot is running in Docker.\n\nTo view logs, use:\n  docker-compose logs -f bot'
-                    return FakeResult(output)
-                elif IS_WINDOWS:
-                    return subprocess.run(
-                        ['powershell', '-Command', cmd],
-                        capture_output=True,
-                        text=True,
-                        timeout=30,
-                        cwd=cwd or os.path.dirname(os.path.abspath(__file__))
-                    )
-                else:
-                    return subprocess.run(
-                        cmd,
-                        shell=True,
-                        capture_output=True,
-                        text=True,
-                        timeout=30,
-                        cwd=cwd or os.path.dirname(os.path.abspath(__file__))
-                    )
-            else:
-                if IS_WINDOWS:
-                    return subprocess.run(
-                        ['powershell', '-Command', cmd],
-                        capture_output=True,
-                        text=True,
-                        timeout=30,
-                        cwd=cwd or os.path.dirname(os.path.abspath(__file__))
-                    )
-                else:
-                    return subprocess.run(
-                        cmd,
-                        shell=True,
-                        capture_output=True,
-                        text=True,
-                        timeout=30,
-                        cwd=cwd or os.path.dirname(os.path.abspath(__file__))
-                    )
+            if cmd_key in NATIVE_COMMANDS:
+                return NATIVE_COMMANDS[cmd_key]()
+            if docker_logs:
+                log_paths = ['/app/bot/bot.log', 'bot.log', '/app/logs/bot.log']
+                output = None
+                for log_path in log_paths:
+                    if os.path.exists(log_path):
+                        try:
+                            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
+                                lines = f.readlines()
+                                output = ''.join(lines[-20:]) if len(lines) > 20 else ''.join(lines)
+                                break
+                        except:
+                            continue
+                if not output:
+                    output = '📋 Bot is running in Docker.\n\nTo view logs, use:\n  docker-compose logs -f bot'
+                return FakeResult(output)
+            return run_shell(cmd, cwd or os.path.dirname(os.path.abspath(__file__)))
         except subprocess.TimeoutExpired as e:
             logger.warning(f"⏱️  Command timed out: {cmd[:50]}...")
             raise
@@ -451,15 +841,588 @@ async def run_command_async(cmd, cmd_key, cwd=None):
             logger.error(f"❌ Command execution error: {e}", exc_info=True)
             raise
     
+    def run_and_cache():
+        result = run_subprocess()
+        if cacheable:
+            result_cache.put(cmd_key, cmd, result)
+        return result
+    
+    # Raten brauchen eine Basis: gewartet wird im Event Loop, nicht auf einem Executor-Thread
+    if cmd_key in NATIVE_WARMUP:
+        delay = await loop.run_in_executor(executor, NATIVE_WARMUP[cmd_key])
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
     # Führe subprocess in Thread Pool aus
     try:
-        result = await loop.run_in_executor(executor, run_subprocess)
+        result = await loop.run_in_executor(executor, run_and_cache)
         return result
     except subprocess.TimeoutExpired:
         raise
     except Exception as e:
         raise
 
+# Callback Handler für Quick Actions
+async def handle_quick_action(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler für Quick Action Buttons"""
+    logger = logging.getLogger(__name__)
+    query = update.callback_query
+    
+    if not query:
+        logger.error("❌ No callback query in update")
+        return
+    
+    logger.info(f"🔔 Callback query received: {query.data}")
+    await query.answer()
+    
+    user_id = query.from_user.id
+    username = query.from_user.username or "N/A"
+    
+    # Finde Index des Users
+    try:
+        user_index = ALLOWED_USER_IDS.index(user_id)
+        match_status = f"Match: User[{user_index}]"
+    except ValueError:
+        match_status = "No Match"
+    
+    if user_id not in ALLOWED_USER_IDS:
+        logger.warning(f"⚠️  Unauthorized quick action from User ID: {user_id} (@{username}) - {match_status}")
+        await query.edit_message_text("❌ Unauthorized", reply_markup=get_inline_menu_keyboard())
+        return
+    
+    action = query.data
+    logger.info(f"⚡ Quick action '{action}' from User ID: {user_id} (@{username}) - {match_status}")
+    
+    # Refresh-Button: gleicher Command, aber am Cache vorbei
+    use_cache = True
+    if action.startswith('refresh_'):
+        cmd_key = action[len('refresh_'):] if action[len('refresh_'):] in COMMANDS else None
+        use_cache = False
+    else:
+        cmd_key = QUICK_ACTIONS.get(action)
+    if not cmd_key:
+        await query.edit_message_text("❌ Unknown action", reply_markup=get_inline_menu_keyboard())
+        return
+    
+    cmd = COMMANDS.get(cmd_key, '')
+    if not cmd:
+        await query.edit_message_text("❌ Command not found", reply_markup=get_inline_menu_keyboard())
+        return
+    
+    # Command ausführen
+    try:
+        # Command asynchron ausführen (blockiert Event Loop nicht)
+        # Schnelle Commands: Status und Ergebnis in einem einzigen Edit
+        logger.info(f"🔄 Executing quick action command asynchronously: {cmd_key}")
+        result, _ = await run_with_status(
+            run_command_async(cmd, cmd_key, cwd=os.path.dirname(os.path.abspath(__file__)), use_cache=use_cache,
+                              audit=(query.from_user, 'button')),
+            lambda: query.edit_message_text(f"⚙️ Running: `{cmd}`", parse_mode="Markdown", reply_markup=get_inline_menu_keyboard()),
+            STATUS_DELAY
+        )
+        
+        output = result.stdout if result.stdout else result.stderr
+        if not output:
+            output = "✅ Done (no output)"
+        output = output[:4000] if output else "✅ Done (no output)"
+        
+        output_length = len(output) if output else 0
+        logger.info(f"✅ Quick action '{action}' completed successfully (output: {output_length} chars)")
+        
+        # edit_message_text erlaubt nur InlineKeyboardMarkup
+        cache_note = format_cache_note(result)
+        await query.edit_message_text(
+            f"```\n{output}\n```{cache_note}", 
+            parse_mode="Markdown",
+            reply_markup=get_inline_menu_keyboard(refresh_key=cmd_key if cache_note else None)
+        )
+    
+    except subprocess.TimeoutExpired:
+        logger.warning(f"⏱️  Quick action '{action}' timed out after 30s from User ID: {user_id} (@{username})")
+        await query.edit_message_text("❌ Timeout (>30s)", reply_markup=get_inline_menu_keyboard())
+    except Overloaded as e:
+        await query.edit_message_text(str(e), reply_markup=get_inline_menu_keyboard())
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f"❌ Quick action '{action}' error from User ID: {user_id} (@{username}): {error_msg}", exc_info=True)
+        await query.edit_message_text(f"❌ Error: {error_msg}", reply_markup=get_inline_menu_keyboard())
+
+# Debug: Alle Updates loggen
+async def log_all_updates(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Loggt alle Updates für Debugging"""
+    logger = logging.getLogger(__name__)
+    user_id = update.effective_user.id if update.effective_user else "Unknown"
+    username = update.effective_user.username if update.effective_user and update.effective_user.username else "N/A"
+    
+    if update.message:
+        text = update.message.text or update.message.caption or "No text"
+        logger.info(f"📨 Message received: '{text[:50]}...' from User ID: {user_id} (@{username})")
+        # Prüfe ob WebApp Data vorhanden ist
+        if hasattr(update.message, 'web_app_data') and update.message.web_app_data:
+            logger.info(f"📱 WebApp data detected in message: {update.message.web_app_data.data}")
+            logger.info(f"📱 WebApp data type: {type(update.message.web_app_data)}")
+        else:
+            logger.debug(f"📨 Message has no web_app_data attribute or it's None")
+    if update.callback_query:
+        logger.info(f"🔔 Callback query received: '{update.callback_query.data}' from User ID: {user_id} (@{username})")
+    if update.edited_message:
+        logger.info(f"✏️  Edited message from User ID: {user_id} (@{username})")
+
+# Handler für Text-Nachrichten von ReplyKeyboard Buttons
+async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler für Text-Nachrichten von ReplyKeyboard Buttons"""
+    logger = logging.getLogger(__name__)
+    user_id = update.effective_user.id
+    username = update.effective_user.username or "N/A"
+    
+    # Finde Index des Users
+    try:
+        user_index = ALLOWED_USER_IDS.index(user_id)
+        match_status = f"Match: User[{user_index}]"
+    except ValueError:
+        match_status = "No Match"
+    
+    if user_id not in ALLOWED_USER_IDS:
+        logger.warning(f"⚠️  Unauthorized text message from User ID: {user_id} (@{username}) - {match_status}")
+        return
+    
+    text = update.message.text
+    logger.info(f"📨 Text message received: '{text}' from User ID: {user_id} (@{username}) - {match_status}")
+    
+    cmd_key = TEXT_COMMANDS.get(text)
+    if not cmd_key:
+        # Nicht ein bekannter Button, ignoriere oder zeige Hilfe
+        await update.message.reply_text(
+            "❌ Unbekannter Befehl. Bitte verwende die Buttons oder öffne das Control Panel.",
+            reply_markup=get_main_menu_keyboard()
+        )
+        return
+    
+    cmd = COMMANDS.get(cmd_key, '')
+    if not cmd:
+        await update.message.reply_text("❌ Command not found", reply_markup=get_main_menu_keyboard())
+        return
+    
+    # Command ausführen (gleiche Logik wie bei Quick Actions)
+    try:
+        logger.info(f"🔄 Executing command from text button asynchronously: {cmd_key}")
+        result, _ = await run_with_status(
+            run_command_async(cmd, cmd_key, cwd=os.path.dirname(os.path.abspath(__file__)),
+                              audit=(update.effective_user, 'keyboard')),
+            lambda: update.message.reply_text(f"⚙️ Running: `{cmd}`", parse_mode="Markdown", reply_markup=get_main_menu_keyboard()),
+            STATUS_DELAY
+        )
+        
+        output = result.stdout if result.stdout else result.stderr
+        if not output:
+            output = "✅ Done (no output)"
+        output = output[:4000] if output else "✅ Done (no output)"
+        
+        output_length = len(output) if output else 0
+        logger.info(f"✅ Command '{cmd_key}' from text button completed successfully (output: {output_length} chars)")
+        
+        cache_note = format_cache_note(result)
+        await update.message.reply_text(
+            f"```\n{output}\n```{cache_note}",
+            parse_mode="Markdown",
+            reply_markup=get_refresh_keyboard(cmd_key) if cache_note else get_main_menu_keyboard()
+        )
+    
+    except subprocess.TimeoutExpired:
+        logger.warning(f"⏱️  Command '{cmd_key}' timed out after 30s from User ID: {user_id} (@{username})")
+        await update.message.reply_text("❌ Timeout (>30s)", reply_markup=get_main_menu_keyboard())
+    except Overloaded as e:
+        await update.message.reply_text(str(e), reply_markup=get_main_menu_keyboard())
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f"❌ Command '{cmd_key}' execution error from User ID: {user_id} (@{username}): {error_msg}", exc_info=True)
+        await update.message.reply_text(f"❌ Error: {error_msg}", reply_markup=get_main_menu_keyboard())
+
+async def health_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler für /health: kompakte Übersicht aller Collectors in einer Nachricht"""
+    logger = logging.getLogger(__name__)
+    user_id = update.effective_user.id
+    username = update.effective_user.username or "N/A"
+    
+    if user_id not in ALLOWED_USER_IDS:
+        await update.message.reply_text("❌ Unauthorized")
+        logger.warning(f"⚠️  Unauthorized /health attempt from User ID: {user_id} (@{username})")
+        return
+    
+    logger.info(f"🩺 /health from User ID: {user_id} (@{username})")
+    try:
+        result, _ = await run_with_status(
+            run_command_async(COMMANDS['health'], 'health', cwd=os.path.dirname(os.path.abspath(__file__)),
+                              audit=(update.effective_user, 'command')),
+            lambda: update.message.reply_text("⚙️ Running health check...", reply_markup=get_main_menu_keyboard()),
+            STATUS_DELAY
+        )
+    except Overloaded as e:
+        await update.message.reply_text(str(e), reply_markup=get_main_menu_keyboard())
+        return
+    report = result.data
+    logger.info(f"🩺 Health: {report['status']} in {report['duration_ms']}ms (complete: {report['complete']})")
+    await update.message.reply_text(
+        f"```\n{result.stdout}\n```\n"
+        f"📊 [Visualisierung in der App öffnen]({build_webapp_link(report)})",
+        parse_mode="Markdown",
+        reply_markup=get_main_menu_keyboard()
+    )
+
+async def audit_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler für /audit [user] [since]: letzte ausgeführte Commands (user = ID, @name oder me)"""
+    logger = logging.getLogger(__name__)
+    user_id = update.effective_user.id
+    username = update.effective_user.username or "N/A"
+    
+    if user_id not in ALLOWED_USER_IDS:
+        await update.message.reply_text("❌ Unauthorized")
+        logger.warning(f"⚠️  Unauthorized /audit attempt from User ID: {user_id} (@{username})")
+        return
+    
+    if audit_log is None:
+        await update.message.reply_text("❌ Audit log ist deaktiviert (AUDIT_ENABLED)")
+        return
+    
+    loop = asyncio.get_event_loop()
+    target_user, since = None, None
+    for arg in (context.args or [])[:2]:
+        if arg.isdigit():
+            target_user = int(arg)
+        elif arg.lower() == 'me':
+            target_user = user_id
+        elif parse_since(arg) is not None:
+            since = parse_since(arg)
+        else:
+            target_user = await loop.run_in_executor(executor, audit_log.resolve_user, arg)
+            if target_user is None:
+                await update.message.reply_text(
+                    f"❌ Unbekannter User: {arg}\n\n"
+                    "Verwendung: /audit [user] [since]\n"
+                    "user: ID, @name oder me · since: 30m, 12h, 7d, 2w oder 2026-01-31"
+                )
+                return
+    
+    entries = await loop.run_in_executor(executor, audit_log.query, target_user, since, AUDIT_LIMIT)
+    logger.info(f"🧾 /audit (user={target_user}, since={since}) from User ID: {user_id} (@{username}): {len(entries)} entries")
+    await update.message.reply_text(
+        f"```\n{format_audit(entries)[:4000]}\n```",
+        parse_mode="Markdown",
+        reply_markup=get_main_menu_keyboard()
+    )
+
+async def selfstats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler für /selfstats: Ressourcen des Bot-Prozesses (RSS, FDs, Loop Lag, Executor, tracemalloc)"""
+    logger = logging.getLogger(__name__)
+    user_id = update.effective_user.id
+    username = update.effective_user.username or "N/A"
+    
+    if user_id not in ALLOWED_USER_IDS:
+        await update.message.reply_text("❌ Unauthorized")
+        logger.warning(f"⚠️  Unauthorized /selfstats attempt from User ID: {user_id} (@{username})")
+        return
+    
+    monitor = init_self_monitor()
+    stats = monitor.snapshot()
+    # tracemalloc Snapshots dauern bei großen Heaps -> nicht im Event Loop
+    allocations = await asyncio.get_event_loop().run_in_executor(executor, monitor.tracemalloc_diff)
+    logger.info(f"🤖 /selfstats from User ID: {user_id} (@{username})")
+    await update.message.reply_text(
+        f"```\n{format_selfstats(stats, allocations)[:4000]}\n```",
+        parse_mode="Markdown",
+        reply_markup=get_main_menu_keyboard()
+    )
+
+# Watch Mode: ein gemeinsamer Scheduler für alle Watches
+watch_scheduler = None
+
+def get_watch_keyboard(watch_id):
+    """InlineKeyboard mit Stop-Button für einen Watch"""
+    return InlineKeyboardMarkup([[InlineKeyboardButton("⏹️ Stop", callback_data=f"watch_stop_{watch_id}")]])
+
+def format_watch_message(watch, output, reason=None):
+    """Nachrichtentext eines Watches (Ausgabe + Status-Zeile)"""
+    if reason:
+        header = f"⏹️ Watch beendet: `{watch.cmd_key}` ({reason})"
+    else:
+        remaining = max(0, int((watch.expires - time.monotonic()) / 60))
+        header = f"👁️ Watch: `{watch.cmd_key}` (alle {watch.interval:g}s, noch ~{remaining} min)"
+    body = (output or "⚙️ Running...")[:3500]
+    changed = time.strftime('%H:%M:%S', time.localtime(watch.last_change)) if watch.last_change else "-"
+    return f"{header}\n```\n{body}\n```\n🕒 Letzte Änderung: {changed} · {watch.runs} Läufe"
+
+def init_watch_scheduler(bot):
+    """Erstellt den Watch Scheduler (Commands laufen im Executor, Edits über den Bot)"""
+    global watch_scheduler
+    
+    async def run_watch(watch):
+        cmd = COMMANDS[watch.cmd_key]
+        # Watches wollen aktuelle Werte -> am Cache vorbei
+        result = await run_command_async(cmd, watch.cmd_key, cwd=os.path.dirname(os.path.abspath(__file__)), use_cache=False)
+        return (result.stdout if result.stdout else result.stderr) or "✅ Done (no output)"
+    
+    async def publish_watch(watch, output, reason):
+        try:
+            await bot.edit_message_text(
+                format_watch_message(watch, output, reason),
+                chat_id=watch.chat_id,
+                message_id=watch.message_id,
+                parse_mode="Markdown",
+                reply_markup=None if reason else get_watch_keyboard(watch.watch_id)
+            )
+        except BadRequest as e:
+            if 'not modified' in str(e).lower():
+                return True
+            if 'not found' in str(e).lower() or "can't be edited" in str(e).lower():
+                return False
+            raise
+        return True
+    
+    watch_scheduler = WatchScheduler(run_watch, publish_watch, max_watches=WATCH_MAX_ACTIVE)
+    return watch_scheduler
+
+async def watch_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler für /watch <command> [interval] [minuten] bzw. /watch stop"""
+    logger = logging.getLogger(__name__)
+    user_id = update.effective_user.id
+    username = update.effective_user.username or "N/A"
+    
+    if user_id not in ALLOWED_USER_IDS:
+        await update.message.reply_text("❌ Unauthorized")
+        logger.warning(f"⚠️  Unauthorized /watch attempt from User ID: {user_id} (@{username})")
+        return
+    
+    chat_id = update.effective_chat.id
+    args = context.args or []
+    
+    if not args:
+        active = watch_scheduler.watches_for_chat(chat_id)
+        lines = [
+            "👁️ Usage: /watch <command> [interval] [minuten]",
+            f"Beispiel: /watch processes 10s (min. {WATCH_MIN_INTERVAL:g}s, max. {WATCH_MAX_MINUTES:g} min)",
+            "Stoppen: /watch stop",
+            "",
+            "Commands: " + ", ".join(sorted(COMMANDS)),
+        ]
+        if active:
+            lines.append("")
+            lines.append("Aktiv: " + ", ".join(f"#{w.watch_id} {w.cmd_key} ({w.interval:g}s)" for w in active))
+        await update.message.reply_text("\n".join(lines))
+        return
+    
+    if args[0].lower() == 'stop':
+        active = watch_scheduler.watches_for_chat(chat_id)
+        for watch in active:
+            await watch_scheduler.stop(watch.watch_id, 'stopped')
+        await update.message.reply_text(f"⏹️ {len(active)} Watch(es) gestoppt")
+        return
+    
+    cmd_key = args[0]
+    if cmd_key not in COMMANDS:
+        await update.message.reply_text(f"❌ Unknown command: {cmd_key}\nCommands: " + ", ".join(sorted(COMMANDS)))
+        return
+    
+    interval = parse_interval(args[1]) if len(args) > 1 else WATCH_DEFAULT_INTERVAL
+    if interval is None:
+        await update.message.reply_text("❌ Ungültiges Intervall (z.B. 10, 30s, 2m)")
+        return
+    interval = max(interval, WATCH_MIN_INTERVAL)
+    
+    minutes = WATCH_MAX_MINUTES
+    if len(args) > 2:
+        try:
+            minutes = min(float(args[2]), WATCH_MAX_MINUTES)
+        except ValueError:
+            minutes = None
+        # float() akzeptiert auch nan/inf und negative Werte -> Watch würde nie bzw. sofort ablaufen
+        if minutes is None or not (math.isfinite(minutes) and minutes > 0):
+            await update.message.reply_text("❌ Ungültige Dauer (Minuten)")
+            return
+    
+    if len(watch_scheduler) >= WATCH_MAX_ACTIVE:
+        await update.message.reply_text(f"❌ Zu viele aktive Watches (max. {WATCH_MAX_ACTIVE})")
+        return
+    
+    message = await update.message.reply_text(f"👁️ Watch: {cmd_key} (alle {interval:g}s)\n⚙️ Starting...")
+    watch = watch_scheduler.add(chat_id, message.message_id, cmd_key, interval, minutes * 60)
+    if watch is None:
+        # Limit zwischen Prüfung und add() durch einen parallelen /watch erreicht
+        await message.edit_text(f"❌ Zu viele aktive Watches (max. {WATCH_MAX_ACTIVE})")
+        return
+    logger.info(f"👁️  /watch {cmd_key} every {interval:g}s for {minutes:g} min from User ID: {user_id} (@{username})")
+    audit_event(update.effective_user, 'watch', cmd_key, f"every {interval:g}s for {minutes:g} min", status='started')
+    await message.edit_reply_markup(reply_markup=get_watch_keyboard(watch.watch_id))
+
+async def handle_watch_stop(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler für den Stop-Button eines Watches"""
+    logger = logging.getLogger(__name__)
+    query = update.callback_query
+    user_id = query.from_user.id
+    
+    if user_id not in ALLOWED_USER_IDS:
+        logger.warning(f"⚠️  Unauthorized watch stop from User ID: {user_id}")
+        await query.answer("❌ Unauthorized")
+        return
+    
+    watch_id = int(query.data[len('watch_stop_'):])
+    if await watch_scheduler.stop(watch_id, 'stopped'):
+        await query.answer("⏹️ Watch gestoppt")
+    else:
+        await query.answer("Watch ist nicht mehr aktiv")
+        await query.edit_message_reply_markup(reply_markup=None)
+
+# Log Follow: inotify (bzw. Polling) pro Datei, gedrosselte Zustellung
+follow_manager = None
+
+def get_follow_keyboard(follow_id):
+    """InlineKeyboard mit Stop-Button für ein Follow"""
+    return InlineKeyboardMarkup([[InlineKeyboardButton("⏹️ Stop", callback_data=f"follow_stop_{follow_id}")]])
+
+def init_follow_manager(bot):
+    """Erstellt den Follow Manager (Zeilen als Plain Text, Logs können Markdown-Zeichen enthalten)"""
+    global follow_manager
+    
+    async def publish_follow(follow, text, message_id, reason):
+        reply_markup = None if reason else get_follow_keyboard(follow.follow_id)
+        if message_id is None:
+            message = await bot.send_message(follow.chat_id, text, reply_markup=reply_markup)
+            return message.message_id
+        try:
+            await bot.edit_message_text(text, chat_id=follow.chat_id, message_id=message_id, reply_markup=reply_markup)
+        except BadRequest as e:
+            if 'not modified' in str(e).lower():
+                return message_id
+            if 'not found' in str(e).lower() or "can't be edited" in str(e).lower():
+                return None
+            raise
+        return message_id
+    
+    follow_manager = FollowManager(
+        publish_follow,
+        flush_interval=FOLLOW_FLUSH_INTERVAL,
+        budget_bytes=FOLLOW_BUDGET_BYTES,
+        max_follows=FOLLOW_MAX_ACTIVE
+    )
+    return follow_manager
+
+async def follow_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler für /follow <pfad> [minuten] bzw. /follow stop"""
+    logger = logging.getLogger(__name__)
+    user_id = update.effective_user.id
+    username = update.effective_user.username or "N/A"
+    
+    if user_id not in ALLOWED_USER_IDS:
+        await update.message.reply_text("❌ Unauthorized")
+        logger.warning(f"⚠️  Unauthorized /follow attempt from User ID: {user_id} (@{username})")
+        return
+    
+    chat_id = update.effective_chat.id
+    args = context.args or []
+    
+    if not args:
+        active = follow_manager.follows_for_chat(chat_id)
+        lines = [
+            "📜 Usage: /follow <pfad> [minuten]",
+            "Beispiel: /follow /var/log/syslog",
+            "Stoppen: /follow stop",
+            "",
+            "Erlaubt: " + ", ".join(FOLLOW_ALLOWED_PATHS),
+        ]
+        if active:
+            lines.append("")
+            lines.append("Aktiv: " + ", ".join(f"#{f.follow_id} {f.display_path} ({f.mode})" for f in active))
+        await update.message.reply_text("\n".join(lines))
+        return
+    
+    if args[0].lower() == 'stop':
+        active = follow_manager.follows_for_chat(chat_id)
+        for follow in active:
+            await follow_manager.stop(follow.follow_id, 'stopped')
+        await update.message.reply_text(f"⏹️ {len(active)} Follow(s) gestoppt")
+        return
+    
+    path = args[0]
+    # Pfade sind Host-Pfade; im Container liegt der Host unter HOST_ROOT
+    follow_root = HOST_ROOT if os.path.isdir(HOST_ROOT) else '/'
+    try:
+        local_path = resolve_follow_path(path, follow_root, FOLLOW_ALLOWED_PATHS)
+    except ValueError as e:
+        logger.warning(f"⚠️  /follow {path} rejected for User ID: {user_id} (@{username}): {e}")
+        await update.message.reply_text(f"❌ {e}")
+        return
+    
+    minutes = FOLLOW_MAX_MINUTES
+    if len(args) > 1:
+        try:
+            minutes = min(float(args[1]), FOLLOW_MAX_MINUTES)
+        except ValueError:
+            minutes = None
+        # float() akzeptiert auch nan/inf und negative Werte -> Follow würde nie bzw. sofort ablaufen
+        if minutes is None or not (math.isfinite(minutes) and minutes > 0):
+            await update.message.reply_text("❌ Ungültige Dauer (Minuten)")
+            return
+    
+    try:
+        follow = await follow_manager.start(chat_id, path, local_path, minutes * 60)
+    except FileNotFoundError:
+        await update.message.reply_text(f"❌ Datei nicht gefunden: {path}")
+        return
+    except OSError as e:
+        await update.message.reply_text(f"❌ Datei nicht lesbar: {e}")
+        return
+    if follow is None:
+        await update.message.reply_text(f"❌ Zu viele aktive Follows (max. {FOLLOW_MAX_ACTIVE})")
+        return
+    logger.info(f"📜 /follow {path} ({follow.mode}) for {minutes:g} min from User ID: {user_id} (@{username})")
+    audit_event(update.effective_user, 'follow', 'follow', path, status='started')
+
+async def handle_follow_stop(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler für den Stop-Button eines Follows"""
+    logger = logging.getLogger(__name__)
+    query = update.callback_query
+    user_id = query.from_user.id
+    
+    if user_id not in ALLOWED_USER_IDS:
+        logger.warning(f"⚠️  Unauthorized follow stop from User ID: {user_id}")
+        await query.answer("❌ Unauthorized")
+        return
+    
+    follow_id = int(query.data[len('follow_stop_'):])
+    if await follow_manager.stop(follow_id, 'stopped'):
+        await query.answer("⏹️ Follow gestoppt")
+    else:
+        await query.answer("Follow ist nicht mehr aktiv")
+        await query.edit_message_reply_markup(reply_markup=None)
+
+async def post_init(application):
+    """Startet Hintergrund-Tasks, sobald der Event Loop läuft"""
+    if self_monitor is not None:
+        self_monitor.on_hard_limit = lambda reason: asyncio.get_running_loop().create_task(restart_gracefully(application))
+        self_monitor.start()
+
+def build_application():
+    """Erstellt die Application mit eigenen Connection Pools für Sends und getUpdates"""
+    logger = logging.getLogger(__name__)
+    request_kwargs = dict(
+        http_version=TG_HTTP_VERSION,
+        connect_timeout=TG_CONNECT_TIMEOUT,
+        read_timeout=TG_READ_TIMEOUT,
+        write_timeout=TG_WRITE_TIMEOUT,
+    )
+    builder = (
+        Application.builder()
+        .token(TOKEN)
+        .request(build_request(TG_POOL_SIZE, **request_kwargs))
+        .get_updates_request(build_request(TG_UPDATES_POOL_SIZE, **request_kwargs))
+        .concurrent_updates(PerChatUpdateProcessor(MAX_CONCURRENT_UPDATES))
+        .post_init(post_init)
+    )
+    if TG_RATE_LIMIT:
+        builder = builder.rate_limiter(ChatRateLimiter(max_retries=TG_MAX_RETRIES))
+    logger.info(f"🌐 Telegram client: HTTP/{TG_HTTP_VERSION}, pool={TG_POOL_SIZE}, updates pool={TG_UPDATES_POOL_SIZE}, rate limit={TG_RATE_LIMIT}")
+    logger.info(f"🔀 Concurrent updates: {MAX_CONCURRENT_UPDATES} (ordered per chat), executor workers: {EXECUTOR_WORKERS}")
+    return builder.build()
+
 def main():
     """Main Function"""
     # Logging konfigurieren (muss vor Validierung sein)
@@ -598,205 +1561,37 @@ def main():
         sys.exit(1)
     
     # Application erstellen
-    application = Application.builder().token(TOKEN).build()
-    
-    # Callback Handler für Quick Actions
-    async def handle_quick_action(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handler für Quick Action Buttons"""
-        logger = logging.getLogger(__name__)
-        query = update.callback_query
-        
-        if not query:
-            logger.error("❌ No callback query in update")
-            return
-        
-        logger.info(f"🔔 Callback query received: {query.data}")
-        await query.answer()
-        
-        user_id = query.from_user.id
-        username = query.from_user.username or "N/A"
-        
-        # Finde Index des Users
-        try:
-            user_index = ALLOWED_USER_IDS.index(user_id)
-            match_status = f"Match: User[{user_index}]"
-        except ValueError:
-            match_status = "No Match"
-        
-        if user_id not in ALLOWED_USER_IDS:
-            logger.warning(f"⚠️  Unauthorized quick action from User ID: {user_id} (@{username}) - {match_status}")
-            await query.edit_message_text("❌ Unauthorized", reply_markup=get_inline_menu_keyboard())
-            return
-        
-        action = query.data
-        logger.info(f"⚡ Quick action '{action}' from User ID: {user_id} (@{username}) - {match_status}")
-        
-        # Mappe Quick Actions zu Commands
-        action_map = {
-            'quick_host_info': 'host_info',
-            'quick_system_info': 'system_info',
-            'quick_disk_space': 'disk_space',
-            'quick_uptime': 'uptime',
-            'quick_processes': 'processes',
-            'quick_temp': 'temp',
-            'quick_memory': 'memory',
-            'quick_bot_logs': 'bot_logs'
-        }
-        
-        cmd_key = action_map.get(action)
-        if not cmd_key:
-            await query.edit_message_text("❌ Unknown action", reply_markup=get_inline_menu_keyboard())
-            return
-        
-        cmd = COMMANDS.get(cmd_key, '')
-        if not cmd:
-            await query.edit_message_text("❌ Command not found", reply_markup=get_inline_menu_keyboard())
-            return
-        
-        # Command ausführen
-        try:
-            await query.edit_message_text(f"⚙️ Running: `{cmd}`", parse_mode="Markdown", reply_markup=get_inline_menu_keyboard())
-            
-            # Command asynchron ausführen (blockiert Event Loop nicht)
-            logger.info(f"🔄 Executing quick action command asynchronously: {cmd_key}")
-            result = await run_command_async(cmd, cmd_key, cwd=os.path.dirname(os.path.abspath(__file__)))
-            
-            output = result.stdout if result.stdout else result.stderr
-            if not output:
-                output = "✅ Done (no output)"
-            output = output[:4000] if output else "✅ Done (no output)"
-            
-            output_length = len(output) if output else 0
-            logger.info(f"✅ Quick action '{action}' completed successfully (output: {output_length} chars)")
-            
-            await query.edit_message_text(
-                f"```\n{output}\n```", 
-                parse_mode="Markdown",
-                reply_markup=get_main_menu_keyboard()
-            )
-            
-        except subprocess.TimeoutExpired:
-            logger.warning(f"⏱️  Quick action '{action}' timed out after 30s from User ID: {user_id} (@{username})")
-            await query.edit_message_text("❌ Timeout (>30s)", reply_markup=get_inline_menu_keyboard())
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"❌ Quick action '{action}' error from User ID: {user_id} (@{username}): {error_msg}", exc_info=True)
-            await query.edit_message_text(f"❌ Error: {error_msg}", reply_markup=get_inline_menu_keyboard())
-    
-    # Debug: Alle Updates loggen
-    async def log_all_updates(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Loggt alle Updates für Debugging"""
-        logger = logging.getLogger(__name__)
-        user_id = update.effective_user.id if update.effective_user else "Unknown"
-        username = update.effective_user.username if update.effective_user and update.effective_user.username else "N/A"
-        
-        if update.message:
-            text = update.message.text or update.message.caption or "No text"
-            logger.info(f"📨 Message received: '{text[:50]}...' from User ID: {user_id} (@{username})")
-            # Prüfe ob WebApp Data vorhanden ist
-            if hasattr(update.message, 'web_app_data') and update.message.web_app_data:
-                logger.info(f"📱 WebApp data detected in message: {update.message.web_app_data.data}")
-                logger.info(f"📱 WebApp data type: {type(update.message.web_app_data)}")
-            else:
-                logger.debug(f"📨 Message has no web_app_data attribute or it's None")
-            # Prüfe alle Attribute der Message
-            logger.debug(f"📨 Message attributes: {dir(update.message)}")
-        if update.callback_query:
-            logger.info(f"🔔 Callback query received: '{update.callback_query.data}' from User ID: {user_id} (@{username})")
-        if update.edited_message:
-            logger.info(f"✏️  Edited message from User ID: {user_id} (@{username})")
+    application = build_application()
+    init_result_cache()
+    init_audit_log()
+    init_exec_worker()
+    init_shell_pool()
+    init_self_monitor()
+    init_watch_scheduler(application.bot)
+    init_follow_manager(application.bot)
     
     # Handlers registrieren
     # WICHTIG: CallbackQueryHandler muss VOR MessageHandler registriert werden!
-    from telegram.ext import CallbackQueryHandler
     # Debug Handler zuerst (mit niedrigster Priorität, group=-1)
-    application.add_handler(MessageHandler(filters.ALL, log_all_updates), group=-1)
-    application.add_handler(CallbackQueryHandler(log_all_updates), group=-1)
-    
-    # Handler für Text-Nachrichten von ReplyKeyboard Buttons
-    async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handler für Text-Nachrichten von ReplyKeyboard Buttons"""
-        logger = logging.getLogger(__name__)
-        user_id = update.effective_user.id
-        username = update.effective_user.username or "N/A"
-        
-        # Finde Index des Users
-        try:
-            user_index = ALLOWED_USER_IDS.index(user_id)
-            match_status = f"Match: User[{user_index}]"
-        except ValueError:
-            match_status = "No Match"
-        
-        if user_id not in ALLOWED_USER_IDS:
-            logger.warning(f"⚠️  Unauthorized text message from User ID: {user_id} (@{username}) - {match_status}")
-            return
-        
-        text = update.message.text
-        logger.info(f"📨 Text message received: '{text}' from User ID: {user_id} (@{username}) - {match_status}")
-        
-        # Mappe Button-Text zu Commands
-        text_to_command = {
-            '🏠 Host Info': 'host_info',
-            '🖥️ System Info': 'system_info',
-            '💾 Disk Space': 'disk_space',
-            '🔄 Uptime': 'uptime',
-            '📈 Top Prozesse': 'processes',
-            '🌡️ Temperature': 'temp',
-            '🧠 Memory': 'memory',
-            '📋 Bot Logs': 'bot_logs'
-        }
-        
-        cmd_key = text_to_command.get(text)
-        if not cmd_key:
-            # Nicht ein bekannter Button, ignoriere oder zeige Hilfe
-            await update.message.reply_text(
-                "❌ Unbekannter Befehl. Bitte verwende die Buttons oder öffne das Control Panel.",
-                reply_markup=get_main_menu_keyboard()
-            )
-            return
-        
-        cmd = COMMANDS.get(cmd_key, '')
-        if not cmd:
-            await update.message.reply_text("❌ Command not found", reply_markup=get_main_menu_keyboard())
-            return
-        
-        # Command ausführen (gleiche Logik wie bei Quick Actions)
-        try:
-            await update.message.reply_text(f"⚙️ Running: `{cmd}`", parse_mode="Markdown", reply_markup=get_main_menu_keyboard())
-            
-            logger.info(f"🔄 Executing command from text button asynchronously: {cmd_key}")
-            result = await run_command_async(cmd, cmd_key, cwd=os.path.dirname(os.path.abspath(__file__)))
-            
-            output = result.stdout if result.stdout else result.stderr
-            if not output:
-                output = "✅ Done (no output)"
-            output = output[:4000] if output else "✅ Done (no output)"
-            
-            output_length = len(output) if output else 0
-            logger.info(f"✅ Command '{cmd_key}' from text button completed successfully (output: {output_length} chars)")
-            
-            await update.message.reply_text(
-                f"```\n{output}\n```",
-                parse_mode="Markdown",
-                reply_markup=get_main_menu_keyboard()
-            )
-            
-        except subprocess.TimeoutExpired:
-            logger.warning(f"⏱️  Command '{cmd_key}' timed out after 30s from User ID: {user_id} (@{username})")
-            await update.message.reply_text("❌ Timeout (>30s)", reply_markup=get_main_menu_keyboard())
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"❌ Command '{cmd_key}' execution error from User ID: {user_id} (@{username}): {error_msg}", exc_info=True)
-            await update.message.reply_text(f"❌ Error: {error_msg}", reply_markup=get_main_menu_keyboard())
+    # block=False: läuft als eigener Task und verzögert die eigentlichen Handler nicht
+    application.add_handler(MessageHandler(filters.ALL, log_all_updates, block=False), group=-1)
+    application.add_handler(CallbackQueryHandler(log_all_updates, block=False), group=-1)
     
     # Eigentliche Handler (group=0, default)
     application.add_handler(CommandHandler("start", start))
+    application.add_handler(CommandHandler("health", health_command))
+    application.add_handler(CommandHandler("audit", audit_command))
+    application.add_handler(CommandHandler("selfstats", selfstats_command))
+    application.add_handler(CommandHandler("watch", watch_command))
+    application.add_handler(CommandHandler("follow", follow_command))
+    application.add_handler(CallbackQueryHandler(handle_watch_stop, pattern=r'^watch_stop_\d+$'))  # VOR Quick Actions!
+    application.add_handler(CallbackQueryHandler(handle_follow_stop, pattern=r'^follow_stop_\d+$'))
     application.add_handler(CallbackQueryHandler(handle_quick_action))  # VOR MessageHandler!
     # Text-Message Handler für ReplyKeyboard Buttons (muss VOR WebApp Handler sein)
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text_message))
     # WebApp Data Handler - muss explizit auf WEB_APP_DATA filtern
     application.add_handler(MessageHandler(filters.StatusUpdate.WEB_APP_DATA, handle_webapp_data))
-    logger.info("✅ Handlers registered: /start, CallbackQuery, Text Messages, WebApp Data")
+    logger.info("✅ Handlers registered: /start, /health, /audit, /selfstats, /watch, /follow, CallbackQuery, Text Messages, WebApp Data")
     logger.info("✅ Handlers registered: Debug (group=-1), /start, CallbackQuery, WebApp (group=0)")
     
     # Bot Start Info
@@ -820,6 +1615,14 @@ def main():
         logger.info("=" * 60)
         if application:
             try:
+                if watch_scheduler:
+                    await watch_scheduler.shutdown()
+                if follow_manager:
+                    await follow_manager.shutdown()
+                if exec_worker:
+                    await exec_worker.close()
+                if self_monitor:
+                    await self_monitor.stop()
                 await application.stop()
                 await application.shutdown()
                 logger.info("✅ Application stopped gracefully")
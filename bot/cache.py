@@ -0,0 +1,203 @@
+"""
+Persistenter Result-Cache für Commands
+- Key = Hash aus Command-Key, Command und Host-Zustand (Boot-ID, Mount-Tabelle)
+- TTL pro Command, Invalidierung über geänderten Host-Zustand (Reboot, Mounts)
+- LRU im Speicher, Write-Through in eine kleine SQLite-Datei (überlebt Neustarts)
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from collectors import host_proc_path
+
+logger = logging.getLogger(__name__)
+
+# Standard-TTLs (Sekunden) - nur diese Commands werden gecacht
+DEFAULT_TTLS = {
+    'system_info': 3600,
+    'host_info': 600,
+    'disk_space': 60,
+}
+
+# Host-Zustand, bei dessen Änderung ein Eintrag ungültig wird
+DEFAULT_TRIGGERS = {
+    'system_info': ('boot',),
+    'host_info': ('boot',),
+    'disk_space': ('boot', 'mounts'),
+}
+
+
+class CachedResult:
+    """Ergebnis aus dem Cache (gleiche Attribute wie subprocess.CompletedProcess)"""
+
+    def __init__(self, stdout, stderr='', returncode=0, created=None, data=None):
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode = returncode
+        self.created = created if created is not None else time.time()
+        # Strukturierte Daten der Native Collectors (für die Mini App)
+        self.data = data
+
+    @property
+    def cache_age(self):
+        return max(0.0, time.time() - self.created)
+
+
+class ResultCache:
+    """LRU Memory-Tier mit SQLite Write-Through"""
+
+    def __init__(self, path, proc_root='/proc', ttls=None, triggers=None, max_entries=128):
+        self.path = path
+        self.proc_root = proc_root
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.triggers = dict(DEFAULT_TRIGGERS, **(triggers or {}))
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._open()
+
+    def _open(self):
+        try:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, cmd_key TEXT, created REAL, expires REAL, '
+                'stdout TEXT, stderr TEXT, returncode INTEGER, data TEXT)'
+            )
+            # Ältere Cache-Dateien ohne data-Spalte ergänzen
+            columns = [row[1] for row in self._db.execute('PRAGMA table_info(results)')]
+            if 'data' not in columns:
+                self._db.execute('ALTER TABLE results ADD COLUMN data TEXT')
+            now = time.time()
+            self._db.execute('DELETE FROM results WHERE expires <= ?', (now,))
+            rows = self._db.execute(
+                'SELECT key, cmd_key, created, expires, stdout, stderr, returncode, data FROM results '
+                'ORDER BY created DESC LIMIT ?', (self.max_entries,)
+            ).fetchall()
+            self._db.commit()
+            # Älteste zuerst einfügen, damit die LRU-Reihenfolge stimmt
+            for key, cmd_key, created, expires, stdout, stderr, returncode, data in reversed(rows):
+                data = json.loads(data) if data else None
+                self._memory[key] = (cmd_key, expires, CachedResult(stdout, stderr, returncode, created, data))
+            logger.info(f"🗄️  Result cache loaded: {len(rows)} warm entries from {self.path}")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  Result cache disk store unavailable ({e}), using memory only")
+            self._db = None
+
+    def is_cacheable(self, cmd_key):
+        return self.ttls.get(cmd_key, 0) > 0
+
+    def _read(self, name):
+        """Datei relativ zu proc_root (absolute Pfade werden unverändert gelesen)"""
+        try:
+            with open(os.path.join(self.proc_root, name), 'rb') as f:
+                return f.read()
+        except OSError:
+            return b''
+
+    def _host_state(self, cmd_key):
+        """Fingerprint des Host-Zustands für die Trigger dieses Commands"""
+        parts = []
+        for trigger in self.triggers.get(cmd_key, ()):
+            if trigger == 'boot':
+                boot_id = self._read('sys/kernel/random/boot_id')
+                if not boot_id:
+                    # Fallback: Boot-Zeitpunkt aus /proc/stat
+                    boot_id = next((line for line in self._read('stat').splitlines() if line.startswith(b'btime')), b'')
+                parts.append(boot_id)
+            elif trigger == 'mounts':
+                # mountinfo von PID 1: proc_root/mounts zeigt nur die Mounts des Containers
+                parts.append(hashlib.sha1(self._read(host_proc_path(self.proc_root, 'mountinfo'))).digest())
+        return parts
+
+    def _key(self, cmd_key, cmd):
+        digest = hashlib.sha256()
+        for part in [cmd_key.encode(), cmd.encode()] + self._host_state(cmd_key):
+            digest.update(part)
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, cmd_key, cmd):
+        """Gibt ein CachedResult zurück oder None (kein/abgelaufener Eintrag)"""
+        if not self.is_cacheable(cmd_key):
+            return None
+        key = self._key(cmd_key, cmd)
+        with self._lock:
+            entry = self._memory.get(key)
+            if not entry:
+                return None
+            _, expires, result = entry
+            if expires <= time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return result
+
+    def put(self, cmd_key, cmd, result):
+        """Speichert ein erfolgreiches Ergebnis (Memory + Disk)"""
+        if not self.is_cacheable(cmd_key) or result.returncode != 0:
+            return
+        key = self._key(cmd_key, cmd)
+        created = time.time()
+        expires = created + self.ttls[cmd_key]
+        cached = CachedResult(result.stdout, result.stderr, result.returncode, created, getattr(result, 'data', None))
+        with self._lock:
+            self._memory[key] = (cmd_key, expires, cached)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (key, cmd_key, created, expires, cached.stdout, cached.stderr, cached.returncode,
+                         json.dumps(cached.data) if cached.data is not None else None)
+                    )
+                    # Disk-Store klein halten: abgelaufene und überzählige Einträge löschen
+                    self._db.execute('DELETE FROM results WHERE expires <= ?', (created,))
+                    self._db.execute(
+                        'DELETE FROM results WHERE key NOT IN '
+                        '(SELECT key FROM results ORDER BY created DESC LIMIT ?)', (self.max_entries,)
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️  Could not persist cache entry for '{cmd_key}': {e}")
+
+    def invalidate(self, cmd_key=None):
+        """Löscht Einträge (eines Commands oder alle)"""
+        with self._lock:
+            for key in [k for k, entry in self._memory.items() if cmd_key is None or entry[0] == cmd_key]:
+                del self._memory[key]
+            if self._db is not None:
+                try:
+                    if cmd_key is None:
+                        self._db.execute('DELETE FROM results')
+                    else:
+                        self._db.execute('DELETE FROM results WHERE cmd_key = ?', (cmd_key,))
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️  Could not invalidate cache: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def format_age(seconds):
+    """Formatiert ein Alter kompakt, z.B. '45s', '3m 12s', '2h 5m'"""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds // 3600}h {(seconds % 3600) // 60}m"
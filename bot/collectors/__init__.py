@@ -0,0 +1,91 @@
+"""
+Native Collectors - lesen Host-Metriken direkt aus /proc und /sys (unter dem gemounteten Host-Root)
+statt dafür Prozesse zu starten. Jeder Collector liefert strukturierte Daten (für Mini App Charts)
+und eine Text-Darstellung (für Telegram).
+"""
+import os
+import time
+import threading
+
+
+def read_text(path, default=''):
+    """Liest eine kleine Datei aus /proc oder /sys, default bei Fehler"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+    except OSError:
+        return default
+
+
+def host_proc_path(proc_root, *parts):
+    """
+    Pfad unter /proc aus Sicht des Hosts.
+    /proc/net und /proc/self zeigen auf den Namespace des lesenden Prozesses (Container);
+    /proc/1/... gehört zu PID 1 des Hosts. Fällt auf proc_root/... zurück, wenn nicht lesbar.
+    """
+    host_path = os.path.join(proc_root, '1', *parts)
+    if os.access(host_path, os.R_OK):
+        return host_path
+    return os.path.join(proc_root, *parts)
+
+
+def format_bytes(value, suffix=''):
+    """Formatiert Bytes menschenlesbar (1024er Basis), z.B. '1.5G'"""
+    value = float(value)
+    for unit in ('', 'K', 'M', 'G', 'T'):
+        if abs(value) < 1024 or unit == 'T':
+            return f"{value:.0f}{unit}{suffix}" if unit == '' else f"{value:.1f}{unit}{suffix}"
+        value /= 1024
+
+
+class RateSampler:
+    """
+    Liefert (vorheriges, aktuelles) Sample für Raten; thread-sicher, ohne unter dem Lock zu schlafen.
+    - Ein Paar, dessen aktuelles Sample jünger als interval ist, wird wiederverwendet
+      (parallele Aufrufe messen nicht jeweils neu)
+    - Das letzte Sample dient als Basis für das nächste Paar, solange es nicht älter als max_age ist
+    - Fehlt eine brauchbare Basis, wird sie gemessen; gewartet wird außerhalb des Locks
+    - prime() misst nur die Basis und gibt die Wartezeit zurück (Warten z.B. per asyncio.sleep)
+    """
+
+    def __init__(self, sample, interval=1.0, max_age=300.0):
+        self.sample = sample
+        self.interval = interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._last = None
+        self._pair = None
+
+    def _fresh_pair(self, now):
+        if self._pair is not None and now - self._pair[1]['time'] < self.interval:
+            return self._pair
+        return None
+
+    def _baseline_wait(self, now):
+        """Sekunden, bis die Basis alt genug für eine Rate ist (misst eine neue Basis, wenn nötig)"""
+        if self._last is None or now - self._last['time'] > self.max_age:
+            self._last = self.sample()
+            self._pair = None
+        return max(0.0, self.interval - (time.monotonic() - self._last['time']))
+
+    def prime(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._fresh_pair(now) is not None:
+                return 0.0
+            return self._baseline_wait(now)
+
+    def pair(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                pair = self._fresh_pair(now)
+                if pair is not None:
+                    return pair
+                wait = self._baseline_wait(now)
+                if wait <= 0:
+                    current = self.sample()
+                    self._pair = (self._last, current)
+                    self._last = current
+                    return self._pair
+            time.sleep(wait)
@@ -0,0 +1,224 @@
+"""
+Ressourcenverbrauch pro Service/Container über cgroup v2 (/sys/fs/cgroup)
+Pro cgroup: cpu.stat, memory.current, memory.stat, io.stat und {cpu,memory,io}.pressure.
+CPU- und I/O-Raten werden aus zwei aufeinanderfolgenden Samples berechnet.
+Container-IDs werden (falls der Docker Socket gemountet ist) auf Container-Namen abgebildet.
+"""
+import os
+import re
+import json
+import time
+import socket
+import threading
+import http.client
+
+from collectors import read_text, format_bytes, RateSampler
+from collectors.iostat import parse_pressure
+
+# docker-<id>.scope (systemd Driver), docker/<id> (cgroupfs Driver), cri-containerd-<id>.scope, libpod-<id>.scope
+CONTAINER_ID_RE = re.compile(r'(?:^|[-/])([0-9a-f]{64})(?:\.scope)?$')
+SORT_KEYS = {
+    'cpu': 'cpu_percent',
+    'memory': 'memory_bytes',
+    'io': 'io_bytes_per_s',
+}
+
+
+def parse_flat_keyed(text):
+    """Parst 'key value' Zeilen (cpu.stat, memory.stat) zu {key: int}"""
+    values = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(' ')
+        try:
+            values[key] = int(value)
+        except ValueError:
+            continue
+    return values
+
+
+def parse_io_stat(text):
+    """Parst io.stat ('8:0 rbytes=.. wbytes=.. rios=.. wios=..') und summiert über alle Geräte"""
+    totals = {'rbytes': 0, 'wbytes': 0, 'rios': 0, 'wios': 0}
+    for line in text.splitlines():
+        for field in line.split()[1:]:
+            key, _, value = field.partition('=')
+            if key in totals:
+                totals[key] += int(value)
+    return totals
+
+
+def read_int(path):
+    text = read_text(path).strip()
+    return int(text) if text.isdigit() else None
+
+
+class DockerNames:
+    """Container-ID -> Name über die Docker Engine API (Unix Socket), gecacht"""
+
+    def __init__(self, socket_path='/var/run/docker.sock', ttl=60.0, timeout=1.0):
+        self.socket_path = socket_path
+        self.ttl = ttl
+        self.timeout = timeout
+        self._names = {}
+        self._fetched = 0.0
+        self._lock = threading.Lock()
+
+    def _fetch(self):
+        conn = http.client.HTTPConnection('localhost', timeout=self.timeout)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+            conn.sock = sock
+            conn.request('GET', '/containers/json?all=1')
+            response = conn.getresponse()
+            if response.status != 200:
+                return {}
+            containers = json.loads(response.read())
+        finally:
+            conn.close()
+        return {
+            c['Id']: (c.get('Names') or [c['Id'][:12]])[0].lstrip('/')
+            for c in containers
+        }
+
+    def lookup(self, container_id):
+        """Name des Containers oder None (Socket nicht verfügbar / unbekannte ID)"""
+        if not os.path.exists(self.socket_path):
+            return None
+        with self._lock:
+            now = time.monotonic()
+            # Unbekannte ID -> neu laden, aber höchstens alle 5s (z.B. kurzlebige Container)
+            stale = now - self._fetched > self.ttl
+            unknown = container_id not in self._names and now - self._fetched > 5
+            if stale or unknown:
+                try:
+                    self._names = self._fetch()
+                except (OSError, ValueError, http.client.HTTPException):
+                    self._names = {}
+                self._fetched = now
+            return self._names.get(container_id)
+
+
+def describe_cgroup(path, docker_names=None):
+    """Anzeigename und Art einer cgroup: ('nginx', 'service'), ('web-1', 'container'), ..."""
+    base = os.path.basename(path) or '/'
+    match = CONTAINER_ID_RE.search(path)
+    if match:
+        container_id = match.group(1)
+        name = docker_names.lookup(container_id) if docker_names else None
+        return name or container_id[:12], 'container'
+    for suffix, kind in (('.service', 'service'), ('.scope', 'scope'), ('.slice', 'slice')):
+        if base.endswith(suffix):
+            return base[:-len(suffix)], kind
+    return base, 'cgroup'
+
+
+class CgroupCollector:
+    """Top-N cgroups nach CPU, Memory oder I/O; hält das letzte Sample für Raten"""
+
+    def __init__(self, cgroup_root='/sys/fs/cgroup', max_depth=4, docker_socket='/var/run/docker.sock',
+                 sample_interval=1.0, max_sample_age=300.0):
+        self.cgroup_root = cgroup_root
+        self.max_depth = max_depth
+        self.sample_interval = sample_interval
+        self.max_sample_age = max_sample_age
+        self.docker_names = DockerNames(docker_socket) if docker_socket else None
+        self.sampler = RateSampler(self.sample, sample_interval, max_sample_age)
+
+    def is_available(self):
+        """Nur cgroup v2 (unified hierarchy) wird unterstützt"""
+        return os.path.exists(os.path.join(self.cgroup_root, 'cgroup.controllers'))
+
+    def leaf_cgroups(self):
+        """
+        Relative Pfade der Blatt-cgroups (bzw. cgroups auf max_depth).
+        Eltern enthalten die Werte ihrer Kinder - nur Blätter vermeiden Doppelzählung.
+        """
+        leaves = []
+        for dirpath, dirnames, _ in os.walk(self.cgroup_root):
+            rel = os.path.relpath(dirpath, self.cgroup_root)
+            depth = 0 if rel == '.' else rel.count(os.sep) + 1
+            if depth >= self.max_depth:
+                dirnames[:] = []
+            if depth > 0 and not dirnames:
+                leaves.append(rel)
+        return leaves
+
+    def read_cgroup(self, rel):
+        path = os.path.join(self.cgroup_root, rel)
+        cpu = parse_flat_keyed(read_text(os.path.join(path, 'cpu.stat')))
+        memory = parse_flat_keyed(read_text(os.path.join(path, 'memory.stat')))
+        pressure = {}
+        for resource in ('cpu', 'memory', 'io'):
+            text = read_text(os.path.join(path, f'{resource}.pressure'))
+            if text:
+                pressure[resource] = parse_pressure(text).get('some', {}).get('avg10', 0.0)
+        return {
+            'cpu_usec': cpu.get('usage_usec'),
+            'memory_current': read_int(os.path.join(path, 'memory.current')),
+            'memory_anon': memory.get('anon', 0),
+            'memory_file': memory.get('file', 0),
+            'io': parse_io_stat(read_text(os.path.join(path, 'io.stat'))),
+            'pressure': pressure,
+        }
+
+    def sample(self):
+        return {
+            'time': time.monotonic(),
+            'groups': {rel: self.read_cgroup(rel) for rel in self.leaf_cgroups()},
+        }
+
+    def top(self, limit=10, sort='cpu'):
+        """Die limit cgroups mit dem höchsten Verbrauch (sort: cpu, memory oder io)"""
+        previous, current = self.sampler.pair()
+        elapsed = current['time'] - previous['time']
+        groups = []
+        for rel, now in current['groups'].items():
+            before = previous['groups'].get(rel)
+            if not before or now['cpu_usec'] is None:
+                # Neue cgroup (noch keine Rate) oder ohne CPU-Controller
+                continue
+            cpu_delta = max(0, now['cpu_usec'] - (before['cpu_usec'] or 0))
+            read_rate = max(0, now['io']['rbytes'] - before['io']['rbytes']) / elapsed
+            write_rate = max(0, now['io']['wbytes'] - before['io']['wbytes']) / elapsed
+            name, kind = describe_cgroup(rel, self.docker_names)
+            groups.append({
+                'name': name,
+                'kind': kind,
+                'path': '/' + rel,
+                # 100% = ein voll ausgelasteter Kern
+                'cpu_percent': round(cpu_delta / (elapsed * 1e6) * 100, 1),
+                'memory_bytes': now['memory_current'] or 0,
+                'memory_anon': now['memory_anon'],
+                'memory_file': now['memory_file'],
+                'io_read_bytes_per_s': round(read_rate, 1),
+                'io_write_bytes_per_s': round(write_rate, 1),
+                'io_bytes_per_s': round(read_rate + write_rate, 1),
+                'pressure': now['pressure'],
+            })
+        sort_key = SORT_KEYS.get(sort, 'cpu_percent')
+        groups.sort(key=lambda g: g[sort_key], reverse=True)
+        return {
+            'type': 'cgroups',
+            'interval_s': round(elapsed, 2),
+            'sort': sort if sort in SORT_KEYS else 'cpu',
+            'total': len(groups),
+            'groups': groups[:limit],
+        }
+
+
+def format_cgroups(data):
+    """Text-Tabelle für Telegram"""
+    if not data['groups']:
+        return "📦 No cgroups found"
+    lines = [f"📦 Top {len(data['groups'])}/{data['total']} Services & Container nach {data['sort']} (Intervall {data['interval_s']}s)", "",
+             f"{'Name':<22} {'Kind':<9} {'CPU':>6} {'Memory':>8} {'IO/s':>8} {'PSI':>5}"]
+    for g in data['groups']:
+        # Höchster PSI-Wert (some avg10) über CPU/Memory/IO
+        psi = max(g['pressure'].values(), default=0.0)
+        lines.append(
+            f"{g['name'][:22]:<22} {g['kind']:<9} {g['cpu_percent']:>5.1f}% {format_bytes(g['memory_bytes']):>8} "
+            f"{format_bytes(g['io_bytes_per_s']):>8} {psi:>5.1f}"
+        )
+    return '\n'.join(lines)
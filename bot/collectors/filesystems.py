@@ -0,0 +1,173 @@
+"""
+Dateisystem-Belegung ohne `df`: Mount-Tabelle aus /proc/<pid>/mountinfo, Größen per os.statvfs
+- Pseudo-Dateisysteme (proc, sysfs, overlay, tmpfs, ...) werden übersprungen
+- Bind-Mounts werden über die Geräte-ID (major:minor) dedupliziert
+- Netzwerk-Dateisysteme werden mit Timeout abgefragt, damit hängende NFS-Mounts nicht blockieren
+"""
+import os
+import re
+import math
+import time
+import threading
+
+from collectors import read_text, host_proc_path, format_bytes
+
+# Dateisysteme ohne echten Speicherplatz
+PSEUDO_FSTYPES = {
+    'proc', 'sysfs', 'devtmpfs', 'devpts', 'tmpfs', 'ramfs', 'overlay', 'cgroup', 'cgroup2',
+    'mqueue', 'debugfs', 'tracefs', 'securityfs', 'pstore', 'bpf', 'autofs', 'configfs',
+    'fusectl', 'hugetlbfs', 'binfmt_misc', 'nsfs', 'efivarfs', 'rpc_pipefs', 'selinuxfs',
+    'squashfs', 'fuse.lxcfs', 'fuse.portal', 'nfsd',
+}
+# Dateisysteme, deren statvfs() hängen kann
+NETWORK_FSTYPES = {'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', '9p', 'ceph', 'glusterfs', 'fuse.sshfs', 'fuse.rclone'}
+
+
+def unescape_mount_path(path):
+    """mountinfo kodiert Leerzeichen etc. oktal (z.B. \\040)"""
+    return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), path)
+
+
+def parse_mountinfo(text):
+    """Parst /proc/<pid>/mountinfo zu einer Liste von Mount-Dicts"""
+    mounts = []
+    for line in text.splitlines():
+        fields = line.split()
+        if ' - ' not in line or len(fields) < 10:
+            continue
+        separator = fields.index('-')
+        mounts.append({
+            'mount_id': int(fields[0]),
+            'device': fields[2],
+            'root': unescape_mount_path(fields[3]),
+            'mount_point': unescape_mount_path(fields[4]),
+            'fstype': fields[separator + 1],
+            'source': unescape_mount_path(fields[separator + 2]),
+        })
+    return mounts
+
+
+def select_real_mounts(mounts, include_tmpfs=False):
+    """Filtert Pseudo-Dateisysteme und dedupliziert Bind-Mounts (gleiches Gerät)"""
+    by_device = {}
+    for mount in mounts:
+        fstype = mount['fstype']
+        if fstype in PSEUDO_FSTYPES and not (include_tmpfs and fstype == 'tmpfs'):
+            continue
+        if fstype.startswith('fuse.') and fstype not in NETWORK_FSTYPES:
+            continue
+        current = by_device.get(mount['device'])
+        # Bevorzugt den "echten" Mount (root = /), sonst den kürzesten Mount-Pfad
+        rank = (mount['root'] != '/', len(mount['mount_point']))
+        if current is None or rank < (current['root'] != '/', len(current['mount_point'])):
+            by_device[mount['device']] = mount
+    return sorted(by_device.values(), key=lambda m: m['mount_point'])
+
+
+def statvfs_with_timeout(path, timeout):
+    """os.statvfs in einem Daemon-Thread; None bei Timeout (der Thread bleibt ggf. hängen)"""
+    result = {}
+
+    def target():
+        try:
+            result['stat'] = os.statvfs(path)
+        except OSError as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=target, name=f'statvfs:{path}', daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        return None
+    if 'error' in result:
+        raise result['error']
+    return result['stat']
+
+
+class FilesystemCollector:
+    """Belegung aller echten Dateisysteme des Hosts"""
+
+    def __init__(self, proc_root='/proc', host_root='/', network_timeout=2.0, stale_retry=300.0, include_tmpfs=False):
+        self.proc_root = proc_root
+        self.host_root = host_root
+        self.network_timeout = network_timeout
+        self.stale_retry = stale_retry
+        self.include_tmpfs = include_tmpfs
+        # Mount-Punkte, deren statvfs() hing: erst nach stale_retry Sekunden erneut versuchen
+        self._stale = {}
+
+    def mountinfo_path(self):
+        return host_proc_path(self.proc_root, 'mountinfo')
+
+    def is_available(self):
+        return os.path.exists(self.mountinfo_path())
+
+    def _local_path(self, mount_point):
+        """Mount-Punkt des Hosts -> Pfad im Container (unter host_root)"""
+        if self.host_root in ('', '/'):
+            return mount_point
+        return os.path.join(self.host_root, mount_point.lstrip('/'))
+
+    def _statvfs(self, mount):
+        path = self._local_path(mount['mount_point'])
+        if mount['fstype'] not in NETWORK_FSTYPES:
+            return os.statvfs(path)
+        stale_since = self._stale.get(path)
+        if stale_since and time.monotonic() - stale_since < self.stale_retry:
+            return None
+        stat = statvfs_with_timeout(path, self.network_timeout)
+        if stat is None:
+            self._stale[path] = time.monotonic()
+        else:
+            self._stale.pop(path, None)
+        return stat
+
+    def collect(self):
+        """Strukturierte Daten im Format von parse_disk_space() plus fstype und Inodes"""
+        disks = []
+        stale = []
+        for mount in select_real_mounts(parse_mountinfo(read_text(self.mountinfo_path())), self.include_tmpfs):
+            try:
+                stat = self._statvfs(mount)
+            except OSError:
+                continue
+            if stat is None:
+                stale.append(mount['mount_point'])
+                continue
+            if stat.f_blocks == 0:
+                continue
+            size = stat.f_blocks * stat.f_frsize
+            used = (stat.f_blocks - stat.f_bfree) * stat.f_frsize
+            avail = stat.f_bavail * stat.f_frsize
+            inodes_used = stat.f_files - stat.f_ffree
+            disks.append({
+                'filesystem': mount['source'],
+                'fstype': mount['fstype'],
+                'size': format_bytes(size),
+                'used': format_bytes(used),
+                'avail': format_bytes(avail),
+                # Wie df: Anteil an (used + avail), aufgerundet
+                'use_percent': float(math.ceil(used * 100 / (used + avail))) if used + avail else 0.0,
+                'mounted_on': mount['mount_point'],
+                'size_bytes': size,
+                'used_bytes': used,
+                'avail_bytes': avail,
+                'inodes_total': stat.f_files,
+                'inodes_used': inodes_used,
+                'inodes_free': stat.f_ffree,
+                'inodes_use_percent': round(inodes_used * 100 / stat.f_files, 1) if stat.f_files else 0.0,
+            })
+        return {'type': 'disk_space', 'disks': disks, 'stale_mounts': stale}
+
+
+def format_filesystems(data):
+    """Text-Tabelle für Telegram (ähnlich df -h, plus Inode-Belegung)"""
+    lines = [f"{'Filesystem':<20} {'Type':<6} {'Size':>7} {'Used':>7} {'Avail':>7} {'Use%':>5} {'Inode%':>6}  Mounted on"]
+    for d in data['disks']:
+        lines.append(
+            f"{d['filesystem'][-20:]:<20} {d['fstype'][:6]:<6} {d['size']:>7} {d['used']:>7} {d['avail']:>7} "
+            f"{d['use_percent']:>4.0f}% {d['inodes_use_percent']:>5.0f}%  {d['mounted_on']}"
+        )
+    for mount_point in data.get('stale_mounts', []):
+        lines.append(f"⚠️ {mount_point}: not responding (skipped)")
+    return '\n'.join(lines)
@@ -0,0 +1,212 @@
+"""
+Disk I/O, Netzwerk-Durchsatz und Pressure Stall Information (PSI)
+Quellen: /proc/diskstats, /proc/net/dev, /proc/pressure/{cpu,io,memory}
+Raten werden aus zwei aufeinanderfolgenden Samples berechnet.
+"""
+import os
+import re
+import time
+
+from collectors import read_text, host_proc_path, format_bytes, RateSampler
+
+SECTOR_SIZE = 512
+
+# Virtuelle Geräte ohne Aussagekraft
+IGNORED_DISK_PREFIXES = ('loop', 'ram', 'zram', 'fd', 'sr')
+IGNORED_INTERFACES = ('lo',)
+PARTITION_RE = re.compile(r'^(.*?)(p?\d+)$')
+
+
+def parse_diskstats(text):
+    """Parst /proc/diskstats zu {device: counters}"""
+    disks = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) < 14:
+            continue
+        name = fields[2]
+        values = [int(v) for v in fields[3:14]]
+        disks[name] = {
+            'reads': values[0],
+            'sectors_read': values[2],
+            'ms_reading': values[3],
+            'writes': values[4],
+            'sectors_written': values[6],
+            'ms_writing': values[7],
+            'in_flight': values[8],
+            'ms_io': values[9],
+        }
+    return disks
+
+
+def is_partition(name, names):
+    """sda1 / nvme0n1p2 sind Partitionen, wenn das Eltern-Device auch gelistet ist"""
+    match = PARTITION_RE.match(name)
+    return bool(match) and match.group(1) in names and match.group(1) != name
+
+
+def parse_net_dev(text):
+    """Parst /proc/net/dev zu {interface: counters}"""
+    interfaces = {}
+    for line in text.splitlines()[2:]:
+        if ':' not in line:
+            continue
+        name, data = line.split(':', 1)
+        fields = data.split()
+        if len(fields) < 16:
+            continue
+        values = [int(v) for v in fields]
+        interfaces[name.strip()] = {
+            'rx_bytes': values[0],
+            'rx_packets': values[1],
+            'rx_errors': values[2],
+            'rx_drop': values[3],
+            'tx_bytes': values[8],
+            'tx_packets': values[9],
+            'tx_errors': values[10],
+            'tx_drop': values[11],
+        }
+    return interfaces
+
+
+def parse_pressure(text):
+    """Parst eine /proc/pressure/* Datei zu {'some': {...}, 'full': {...}}"""
+    result = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if not fields:
+            continue
+        values = {}
+        for field in fields[1:]:
+            key, _, value = field.partition('=')
+            values[key] = int(value) if key == 'total' else float(value)
+        result[fields[0]] = values
+    return result
+
+
+class IOStatCollector:
+    """Sammelt Disk-, Netzwerk- und PSI-Daten; hält das letzte Sample für Raten"""
+
+    def __init__(self, proc_root='/proc', sample_interval=1.0, max_sample_age=300.0, include_partitions=False):
+        self.proc_root = proc_root
+        self.sample_interval = sample_interval
+        self.max_sample_age = max_sample_age
+        self.include_partitions = include_partitions
+        self.sampler = RateSampler(self.sample, sample_interval, max_sample_age)
+
+    def is_available(self):
+        return os.path.exists(os.path.join(self.proc_root, 'diskstats'))
+
+    def sample(self):
+        return {
+            'time': time.monotonic(),
+            'disks': parse_diskstats(read_text(os.path.join(self.proc_root, 'diskstats'))),
+            'net': parse_net_dev(read_text(host_proc_path(self.proc_root, 'net', 'dev'))),
+        }
+
+    def disk_io(self):
+        """Raten pro Block-Device: Durchsatz, IOPS, Auslastung, Latenz"""
+        previous, current = self.sampler.pair()
+        elapsed = current['time'] - previous['time']
+        names = set(current['disks'])
+        devices = []
+        for name, now in sorted(current['disks'].items()):
+            if name.startswith(IGNORED_DISK_PREFIXES):
+                continue
+            if not self.include_partitions and is_partition(name, names):
+                continue
+            before = previous['disks'].get(name)
+            if not before:
+                continue
+            reads = now['reads'] - before['reads']
+            writes = now['writes'] - before['writes']
+            io_ms = (now['ms_reading'] - before['ms_reading']) + (now['ms_writing'] - before['ms_writing'])
+            devices.append({
+                'device': name,
+                'read_bytes_per_s': round((now['sectors_read'] - before['sectors_read']) * SECTOR_SIZE / elapsed, 1),
+                'write_bytes_per_s': round((now['sectors_written'] - before['sectors_written']) * SECTOR_SIZE / elapsed, 1),
+                'read_iops': round(reads / elapsed, 1),
+                'write_iops': round(writes / elapsed, 1),
+                'util_percent': round(min(100.0, (now['ms_io'] - before['ms_io']) / (elapsed * 1000) * 100), 1),
+                'await_ms': round(io_ms / (reads + writes), 2) if reads + writes else 0.0,
+                'in_flight': now['in_flight'],
+            })
+        return {'type': 'disk_io', 'interval_s': round(elapsed, 2), 'devices': devices}
+
+    def network(self):
+        """Raten pro Netzwerk-Interface: Bytes/Pakete pro Sekunde, Fehler, Drops"""
+        previous, current = self.sampler.pair()
+        elapsed = current['time'] - previous['time']
+        interfaces = []
+        for name, now in sorted(current['net'].items()):
+            if name in IGNORED_INTERFACES:
+                continue
+            before = previous['net'].get(name)
+            if not before:
+                continue
+            rate = lambda key: round((now[key] - before[key]) / elapsed, 1)
+            interfaces.append({
+                'interface': name,
+                'rx_bytes_per_s': rate('rx_bytes'),
+                'tx_bytes_per_s': rate('tx_bytes'),
+                'rx_packets_per_s': rate('rx_packets'),
+                'tx_packets_per_s': rate('tx_packets'),
+                'rx_errors': now['rx_errors'],
+                'tx_errors': now['tx_errors'],
+                'rx_drop': now['rx_drop'],
+                'tx_drop': now['tx_drop'],
+            })
+        return {'type': 'network', 'interval_s': round(elapsed, 2), 'interfaces': interfaces}
+
+    def pressure(self):
+        """PSI (Kernel >= 4.20): Anteil der Zeit, in der Tasks auf CPU/IO/Memory warten"""
+        resources = {}
+        for resource in ('cpu', 'io', 'memory'):
+            text = read_text(os.path.join(self.proc_root, 'pressure', resource))
+            if text:
+                resources[resource] = parse_pressure(text)
+        return {'type': 'pressure', 'available': bool(resources), 'resources': resources}
+
+
+def format_disk_io(data):
+    """Text-Tabelle für Telegram"""
+    if not data['devices']:
+        return "📀 No block devices found"
+    lines = [f"📀 Disk I/O (Intervall {data['interval_s']}s)", "",
+             f"{'Device':<10} {'Read/s':>8} {'Write/s':>8} {'r IOPS':>7} {'w IOPS':>7} {'Util':>6} {'Await':>8}"]
+    for d in data['devices']:
+        lines.append(
+            f"{d['device']:<10} {format_bytes(d['read_bytes_per_s']):>8} {format_bytes(d['write_bytes_per_s']):>8} "
+            f"{d['read_iops']:>7.1f} {d['write_iops']:>7.1f} {d['util_percent']:>5.1f}% {d['await_ms']:>6.2f}ms"
+        )
+    return '\n'.join(lines)
+
+
+def format_network(data):
+    """Text-Tabelle für Telegram"""
+    if not data['interfaces']:
+        return "🌐 No network interfaces found"
+    lines = [f"🌐 Network (Intervall {data['interval_s']}s)", "",
+             f"{'Interface':<12} {'RX/s':>8} {'TX/s':>8} {'RX pkt/s':>9} {'TX pkt/s':>9} {'Err':>5} {'Drop':>6}"]
+    for i in data['interfaces']:
+        errors = i['rx_errors'] + i['tx_errors']
+        drops = i['rx_drop'] + i['tx_drop']
+        lines.append(
+            f"{i['interface'][:12]:<12} {format_bytes(i['rx_bytes_per_s']):>8} {format_bytes(i['tx_bytes_per_s']):>8} "
+            f"{i['rx_packets_per_s']:>9.1f} {i['tx_packets_per_s']:>9.1f} {errors:>5} {drops:>6}"
+        )
+    return '\n'.join(lines)
+
+
+def format_pressure(data):
+    """Text-Tabelle für Telegram"""
+    if not data['available']:
+        return "🧯 Pressure Stall Information not available (Kernel >= 4.20 with CONFIG_PSI required)"
+    lines = ["🧯 Pressure (PSI, % der Zeit mit wartenden Tasks)", "",
+             f"{'Resource':<12} {'avg10':>7} {'avg60':>7} {'avg300':>7}"]
+    for resource, kinds in data['resources'].items():
+        for kind in ('some', 'full'):
+            values = kinds.get(kind)
+            if values:
+                lines.append(f"{resource + ' ' + kind:<12} {values['avg10']:>7.2f} {values['avg60']:>7.2f} {values['avg300']:>7.2f}")
+    return '\n'.join(lines)
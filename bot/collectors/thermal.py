@@ -0,0 +1,166 @@
+"""
+Temperaturen ohne `sensors` (lm-sensors): direkt aus sysfs
+Quellen: /sys/class/hwmon/hwmon*/temp*_input (Chips wie coretemp, k10temp, nvme, ...)
+und /sys/class/thermal/thermal_zone*/temp (ACPI/SoC Thermal Zones).
+Die Sensor-Pfade werden einmal ermittelt und gecacht, pro Sample werden nur die Werte gelesen.
+"""
+import os
+import re
+import time
+import threading
+
+from collectors import read_text
+
+TEMP_INPUT_RE = re.compile(r'^temp(\d+)_input$')
+
+
+def read_millidegrees(path):
+    """Liest einen sysfs-Temperaturwert (Milligrad Celsius) als °C, None wenn nicht lesbar"""
+    text = read_text(path).strip()
+    try:
+        return int(text) / 1000.0
+    except ValueError:
+        return None
+
+
+def list_dir(path):
+    try:
+        return sorted(os.listdir(path))
+    except OSError:
+        return []
+
+
+def discover_hwmon(sys_root):
+    """Ermittelt alle hwmon-Temperatursensoren: [{'source', 'chip', 'label', 'path', 'high', 'critical'}]"""
+    sensors = []
+    base = os.path.join(sys_root, 'class', 'hwmon')
+    for hwmon in list_dir(base):
+        hwmon_dir = os.path.join(base, hwmon)
+        files = list_dir(hwmon_dir)
+        # Ältere Treiber legen die Attribute unter device/ ab
+        if 'name' not in files and os.path.isdir(os.path.join(hwmon_dir, 'device')):
+            hwmon_dir = os.path.join(hwmon_dir, 'device')
+            files = list_dir(hwmon_dir)
+        chip = read_text(os.path.join(hwmon_dir, 'name'), hwmon).strip() or hwmon
+        for name in files:
+            match = TEMP_INPUT_RE.match(name)
+            if not match:
+                continue
+            prefix = os.path.join(hwmon_dir, f'temp{match.group(1)}_')
+            label = read_text(prefix + 'label').strip() or f'temp{match.group(1)}'
+            sensors.append({
+                'source': 'hwmon',
+                'chip': chip,
+                'label': label,
+                'path': prefix + 'input',
+                # Grenzwerte ändern sich praktisch nie -> einmalig bei der Discovery lesen
+                'high': read_millidegrees(prefix + 'max'),
+                'critical': read_millidegrees(prefix + 'crit'),
+            })
+    return sensors
+
+
+def discover_thermal_zones(sys_root):
+    """Ermittelt alle Thermal Zones inkl. Trip Points (passive/critical)"""
+    sensors = []
+    base = os.path.join(sys_root, 'class', 'thermal')
+    for zone in list_dir(base):
+        if not zone.startswith('thermal_zone'):
+            continue
+        zone_dir = os.path.join(base, zone)
+        trips = {}
+        for name in list_dir(zone_dir):
+            if name.startswith('trip_point_') and name.endswith('_type'):
+                trip_type = read_text(os.path.join(zone_dir, name)).strip()
+                trip_temp = read_millidegrees(os.path.join(zone_dir, name[:-len('type')] + 'temp'))
+                if trip_temp is not None and trip_temp > 0:
+                    trips.setdefault(trip_type, trip_temp)
+        sensors.append({
+            'source': 'thermal',
+            'chip': read_text(os.path.join(zone_dir, 'type')).strip() or zone,
+            'label': zone,
+            'path': os.path.join(zone_dir, 'temp'),
+            'high': trips.get('passive') or trips.get('hot'),
+            'critical': trips.get('critical'),
+        })
+    return sensors
+
+
+class ThermalCollector:
+    """Liest alle Temperatursensoren des Hosts; Discovery wird gecacht"""
+
+    def __init__(self, sys_root='/sys', rediscover_interval=600.0):
+        self.sys_root = sys_root
+        self.rediscover_interval = rediscover_interval
+        self._sensors = None
+        self._discovered = 0.0
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        return bool(self.sensors())
+
+    def discover(self):
+        """Sucht die Sensoren neu (z.B. nach Hotplug oder Modul-Reload)"""
+        sensors = discover_hwmon(self.sys_root) + discover_thermal_zones(self.sys_root)
+        with self._lock:
+            self._sensors = sensors
+            self._discovered = time.monotonic()
+        return sensors
+
+    def sensors(self):
+        """Gecachte Sensorliste; wird nach rediscover_interval oder bei Lesefehlern neu ermittelt"""
+        with self._lock:
+            sensors = self._sensors
+            expired = time.monotonic() - self._discovered > self.rediscover_interval
+        if sensors is None or expired:
+            sensors = self.discover()
+        return sensors
+
+    def collect(self):
+        """Aktuelle Temperaturen als strukturierte Daten"""
+        readings = []
+        missing = False
+        for sensor in self.sensors():
+            celsius = read_millidegrees(sensor['path'])
+            if celsius is None:
+                missing = True
+                continue
+            readings.append({
+                'source': sensor['source'],
+                'chip': sensor['chip'],
+                'label': sensor['label'],
+                'celsius': round(celsius, 1),
+                'high': sensor['high'],
+                'critical': sensor['critical'],
+            })
+        if missing:
+            # Sensor verschwunden -> beim nächsten Sample neu suchen
+            with self._lock:
+                self._sensors = None
+        hottest = max((r['celsius'] for r in readings), default=None)
+        return {'type': 'temp', 'sensors': readings, 'max_celsius': hottest}
+
+
+def format_thermal(data):
+    """Text-Darstellung für Telegram (ähnlich `sensors`)"""
+    if not data['sensors']:
+        return "🌡️ No temperature sensors found"
+    lines = ["🌡️ Temperatures", ""]
+    chip = None
+    for sensor in data['sensors']:
+        if sensor['chip'] != chip:
+            chip = sensor['chip']
+            lines.append(f"{chip} ({sensor['source']})")
+        limits = []
+        if sensor['high'] is not None:
+            limits.append(f"high = {sensor['high']:.1f}°C")
+        if sensor['critical'] is not None:
+            limits.append(f"crit = {sensor['critical']:.1f}°C")
+        warning = ''
+        if sensor['critical'] is not None and sensor['celsius'] >= sensor['critical']:
+            warning = ' 🔥'
+        elif sensor['high'] is not None and sensor['celsius'] >= sensor['high']:
+            warning = ' ⚠️'
+        suffix = f"  ({', '.join(limits)})" if limits else ''
+        lines.append(f"  {sensor['label'][:20] + ':':<21} {sensor['celsius']:>6.1f}°C{suffix}{warning}")
+    return '\n'.join(lines)
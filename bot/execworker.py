@@ -0,0 +1,330 @@
+"""
+Isolierter Executor-Prozess für Shell-Commands (nur POSIX)
+Der Bot startet einen überwachten Worker-Prozess und spricht mit ihm über einen Unix Socket (socketpair):
+- Protokoll: Frames aus 4 Byte Länge (big endian) + kompaktes JSON, Antworten über die Request-ID zugeordnet
+- Ausführung, Decoding und Kürzen großer Ausgaben laufen im Worker -> kein GIL-Wettbewerb mit dem Event Loop
+- Der Bot wartet nur auf den Socket (asyncio), keine Executor-Threads pro Command
+- Absturz: offene Requests schlagen fehl, der nächste Request startet einen neuen Worker (mit Backoff)
+- Speicherleck: übersteigt der RSS des Workers max_rss_bytes, wird er ersetzt, sobald er idle ist
+
+Der Worker selbst wird als Skript gestartet: python execworker.py <socket fd> <config json>
+"""
+import os
+import sys
+import json
+import time
+import socket
+import struct
+import asyncio
+import logging
+import itertools
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from shellpool import ShellPool, read_rss
+
+logger = logging.getLogger(__name__)
+
+FRAME_HEADER = struct.Struct('!I')
+MAX_FRAME = 32 * 1024 * 1024
+WORKER_SCRIPT = os.path.abspath(__file__)
+# Der Worker braucht kein Bot Token (und gibt es so auch nicht an Shell-Commands weiter)
+ENV_BLACKLIST = ('BOT_TOKEN',)
+
+
+class WorkerCrashed(Exception):
+    """Worker-Prozess hat sich während eines Requests beendet"""
+
+
+def encode_frame(message):
+    payload = json.dumps(message, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    if len(payload) > MAX_FRAME:
+        raise ValueError(f'frame too large ({len(payload)} bytes)')
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_payload(payload):
+    return json.loads(payload.decode('utf-8'))
+
+
+def truncate_output(text, limit):
+    """Kürzt sehr große Ausgaben im Worker (Telegram zeigt ohnehin nur die ersten paar KB)"""
+    if not limit or len(text) <= limit:
+        return text
+    return text[:limit] + f"\n… ({len(text) - limit} chars truncated)"
+
+
+# --- Worker-Seite (eigener Prozess, blockierender Socket) ---
+
+def recv_exactly(sock, size):
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            return None
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+def recv_frame(sock):
+    """Nächster Frame oder None bei EOF (Bot beendet)"""
+    header = recv_exactly(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f'frame too large ({length} bytes)')
+    payload = recv_exactly(sock, length)
+    return None if payload is None else decode_payload(payload)
+
+
+def serve(sock, config):
+    """Request-Schleife des Workers: liest Frames, führt sie parallel aus, schreibt Antworten"""
+    shell_pool = None
+    if config.get('shell_pool'):
+        shell_pool = ShellPool(**config['shell_pool'])
+    max_output = config.get('max_output', 0)
+    executor = ThreadPoolExecutor(max_workers=config.get('threads', 4))
+    write_lock = threading.Lock()
+
+    def run_command(cmd, cwd, timeout):
+        if shell_pool is not None:
+            return shell_pool.run(cmd, cwd=cwd, timeout=timeout)
+        return subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=timeout, cwd=cwd,
+                              stdin=subprocess.DEVNULL, errors='replace')
+
+    def handle(request):
+        response = {'id': request.get('id')}
+        try:
+            op = request.get('op')
+            if op == 'ping':
+                response['pid'] = os.getpid()
+            elif op == 'run':
+                started = time.monotonic()
+                result = run_command(request['cmd'], request.get('cwd') or '/', request.get('timeout', 30))
+                response.update(
+                    returncode=result.returncode,
+                    stdout=truncate_output(result.stdout or '', max_output),
+                    stderr=truncate_output(result.stderr or '', max_output),
+                    elapsed_ms=round((time.monotonic() - started) * 1000, 1),
+                )
+            else:
+                response['error'] = f'unknown op: {op}'
+        except subprocess.TimeoutExpired:
+            response['error'] = 'timeout'
+        except Exception as e:
+            response['error'] = f'{type(e).__name__}: {e}'
+        frame = encode_frame(response)
+        with write_lock:
+            sock.sendall(frame)
+
+    try:
+        while True:
+            request = recv_frame(sock)
+            if request is None:
+                break
+            executor.submit(handle, request)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if shell_pool is not None:
+            shell_pool.close()
+        sock.close()
+
+
+def worker_main(argv):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | execworker | %(levelname)-8s | %(message)s')
+    sock = socket.socket(fileno=int(argv[1]))
+    config = json.loads(argv[2]) if len(argv) > 2 else {}
+    try:
+        serve(sock, config)
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # Bot ist weg -> Worker endet ebenfalls
+
+
+# --- Bot-Seite (asyncio) ---
+
+class ExecWorker:
+    """
+    Supervisor + Client für den Worker-Prozess.
+    run(cmd, cwd, timeout) liefert ein subprocess.CompletedProcess wie run_shell();
+    der Worker wird beim ersten Request gestartet und bei Bedarf ersetzt.
+    """
+
+    def __init__(self, config=None, max_rss_bytes=256 * 1024 * 1024, grace=5.0, max_backoff=30.0):
+        self.config = config or {}
+        self.max_rss_bytes = max_rss_bytes
+        self.grace = grace
+        self.max_backoff = max_backoff
+        self.process = None
+        self._writer = None
+        self._reader_task = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._start_lock = None
+        self._failures = 0
+        self._next_start = 0.0
+        self._recycle = False
+        self._closed = False
+        self.stats = {'requests': 0, 'started': 0, 'crashes': 0, 'recycled': 0, 'timeouts': 0}
+
+    @property
+    def pid(self):
+        return self.process.pid if self.alive() else None
+
+    @property
+    def in_flight(self):
+        return len(self._pending)
+
+    def alive(self):
+        return self.process is not None and self.process.returncode is None
+
+    def rss(self):
+        return read_rss(self.process.pid) if self.alive() else 0
+
+    async def _ensure_started(self):
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._closed:
+                raise RuntimeError('exec worker closed')
+            if self.alive() and self._writer is not None:
+                return
+            # Nach Abstürzen nicht in einer Schleife neu starten
+            delay = self._next_start - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._start()
+
+    async def _start(self):
+        parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        env = {key: value for key, value in os.environ.items() if key not in ENV_BLACKLIST}
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                sys.executable, WORKER_SCRIPT, str(child.fileno()), json.dumps(self.config),
+                pass_fds=(child.fileno(),),
+                stdin=subprocess.DEVNULL,
+                env=env,
+                cwd=os.path.dirname(WORKER_SCRIPT),
+            )
+        except Exception:
+            parent.close()
+            raise
+        finally:
+            child.close()
+        reader, self._writer = await asyncio.open_unix_connection(sock=parent)
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_loop(self.process, reader))
+        self._recycle = False
+        self.stats['started'] += 1
+        logger.info(f"🧱 Exec worker started (PID {self.process.pid})")
+
+    async def _read_loop(self, process, reader):
+        """Ordnet Antworten den wartenden Requests zu; endet bei EOF (Worker beendet/abgestürzt)"""
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                (length,) = FRAME_HEADER.unpack(header)
+                response = decode_payload(await reader.readexactly(length))
+                future = self._pending.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            await self._reap(process)
+
+    async def _reap(self, process):
+        """Worker ist weg: wartende Requests abbrechen, nächsten Start ggf. verzögern"""
+        try:
+            # Bei EOF räumt der Worker selbst auf (Shell Worker beenden), sonst hart beenden
+            returncode = await asyncio.wait_for(process.wait(), 3)
+        except asyncio.TimeoutError:
+            process.kill()
+            returncode = await process.wait()
+        if process is not self.process:
+            return
+        self._writer = None
+        crashed = bool(self._pending) or not (self._recycle or self._closed)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(WorkerCrashed(f'exec worker exited with code {returncode}'))
+        self._pending.clear()
+        if crashed and not self._closed:
+            self.stats['crashes'] += 1
+            self._failures += 1
+            backoff = min(self.max_backoff, 0.5 * 2 ** (self._failures - 1))
+            self._next_start = time.monotonic() + backoff
+            logger.warning(f"⚠️  Exec worker (PID {process.pid}) exited with code {returncode}, "
+                           f"restart in {backoff:.1f}s")
+
+    async def request(self, message, timeout):
+        await self._ensure_started()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        process = self.process
+        try:
+            self._writer.write(encode_frame(dict(message, id=request_id)))
+            await self._writer.drain()
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # Worker antwortet nicht (hängt) -> ersetzen
+            self.stats['timeouts'] += 1
+            logger.warning(f"⚠️  Exec worker (PID {process.pid}) did not answer within {timeout:g}s, killing it")
+            if process.returncode is None:
+                process.kill()
+            raise
+        except (ConnectionError, AttributeError) as e:
+            raise WorkerCrashed(str(e))
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def run(self, cmd, cwd, timeout=30):
+        """Führt cmd im Worker aus (Ergebnis wie subprocess.run(..., text=True))"""
+        self.stats['requests'] += 1
+        try:
+            response = await self.request({'op': 'run', 'cmd': cmd, 'cwd': cwd, 'timeout': timeout},
+                                          timeout + self.grace)
+        except asyncio.TimeoutError:
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        finally:
+            self._check_memory()
+        error = response.get('error')
+        if error == 'timeout':
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        if error:
+            raise RuntimeError(f'exec worker: {error}')
+        self._failures = 0
+        return subprocess.CompletedProcess(cmd, response['returncode'], response['stdout'], response['stderr'])
+
+    def _check_memory(self):
+        """Ersetzt den Worker, wenn er zu viel Speicher belegt (sobald keine Requests mehr laufen)"""
+        if not self._recycle and self.max_rss_bytes and self.rss() > self.max_rss_bytes:
+            self._recycle = True
+            logger.info(f"♻️  Exec worker (PID {self.process.pid}) above {self.max_rss_bytes // (1024 * 1024)} MB RSS, "
+                        f"recycling when idle")
+        if self._recycle and not self._pending and self.alive():
+            self.stats['recycled'] += 1
+            self._stop_process()
+
+    def _stop_process(self):
+        # Socket schließen -> Worker sieht EOF und beendet sich; _read_loop räumt auf
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def close(self):
+        self._closed = True
+        process = self.process
+        self._stop_process()
+        if process is not None and process.returncode is None:
+            try:
+                await asyncio.wait_for(process.wait(), 3)
+            except asyncio.TimeoutError:
+                process.kill()
+        if self._reader_task:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+if __name__ == '__main__':
+    worker_main(sys.argv)
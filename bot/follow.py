@@ -0,0 +1,383 @@
+"""
+/follow: Log-Dateien des Hosts live verfolgen (wie `tail -F`)
+- Änderungen über inotify (ohne Polling), Fallback: Polling mit Backoff
+- Rotation (neue Inode) und Truncation (Datei kleiner als Leseposition) werden erkannt
+- Neue Zeilen werden gesammelt und gedrosselt als Edit bzw. neue Nachricht zugestellt
+- Byte-Budget pro Minute: ein sehr gesprächiges Log flutet den Chat nicht
+"""
+import os
+import time
+import asyncio
+import itertools
+import logging
+
+from inotify import InotifyDispatcher
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_CHARS = 3800
+MAX_LINE_CHARS = 1000
+MAX_READ_BYTES = 256 * 1024
+
+
+def resolve_follow_path(path, root, allowed_paths):
+    """
+    Host-Pfad -> lokaler Pfad unter root; ValueError, wenn der Pfad (nach Auflösen von Symlinks)
+    nicht unter einem der erlaubten Verzeichnisse liegt.
+    """
+    if not path.startswith('/'):
+        raise ValueError("Pfad muss absolut sein (z.B. /var/log/syslog)")
+    root = os.path.realpath(root)
+    local = os.path.realpath(os.path.join(root, path.lstrip('/')))
+    for allowed in allowed_paths:
+        allowed_local = os.path.realpath(os.path.join(root, allowed.lstrip('/')))
+        if local == allowed_local or local.startswith(allowed_local.rstrip(os.sep) + os.sep):
+            if os.path.isdir(local):
+                raise ValueError("Pfad ist ein Verzeichnis")
+            return local
+    raise ValueError("Pfad nicht erlaubt (erlaubt: " + ", ".join(allowed_paths) + ")")
+
+
+class TailFile:
+    """Liest neu angehängte Zeilen einer Datei; folgt Rotation und Truncation"""
+
+    def __init__(self, path, max_read=MAX_READ_BYTES):
+        self.path = path
+        self.max_read = max_read
+        self._file = None
+        self._id = None
+        self._partial = b''
+        self.position = 0
+        self.rotations = 0
+        self.truncations = 0
+
+    def _open(self, offset=0):
+        try:
+            self._file = open(self.path, 'rb')
+        except OSError:
+            self._file = None
+            return False
+        stat = os.fstat(self._file.fileno())
+        self._id = (stat.st_dev, stat.st_ino)
+        self.position = min(offset, stat.st_size) if offset >= 0 else stat.st_size
+        self._file.seek(self.position)
+        self._partial = b''
+        return True
+
+    def open(self, initial_lines=10):
+        """Öffnet die Datei am Ende und liefert die letzten initial_lines Zeilen"""
+        if not self._open(offset=-1):
+            raise FileNotFoundError(self.path)
+        if initial_lines <= 0:
+            return []
+        start = max(0, self.position - 8192)
+        self._file.seek(start)
+        data = self._file.read(self.position - start)
+        lines = data.split(b'\n')
+        if start > 0:
+            lines = lines[1:]  # erste Zeile ist ggf. abgeschnitten
+        if lines and lines[-1] == b'':
+            lines = lines[:-1]
+        return [self._decode(line) for line in lines[-initial_lines:]]
+
+    def _decode(self, line):
+        return line.decode('utf-8', errors='replace').rstrip('\r')[:MAX_LINE_CHARS]
+
+    def _read(self):
+        """Liest bis zu max_read Bytes; gibt (Zeilen, mehr Daten vorhanden) zurück"""
+        data = self._file.read(self.max_read)
+        self.position += len(data)
+        if not data:
+            return [], False
+        chunks = (self._partial + data).split(b'\n')
+        self._partial = chunks.pop()
+        if len(self._partial) > self.max_read:
+            # Zeile ohne Umbruch, die immer weiter wächst -> abschneiden statt puffern
+            chunks.append(self._partial)
+            self._partial = b''
+        return [self._decode(line) for line in chunks], len(data) == self.max_read
+
+    def read_new(self):
+        """Neue vollständige Zeilen seit dem letzten Aufruf; (Zeilen, mehr Daten vorhanden)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            stat = None
+
+        if self._file is None:
+            # Datei war weg (z.B. gelöscht und noch nicht neu angelegt) -> neue Datei von vorn lesen
+            if stat is None or not self._open(offset=0):
+                return [], False
+            self.rotations += 1
+            return self._read()
+
+        lines = []
+        if stat is not None and (stat.st_dev, stat.st_ino) != self._id:
+            # Rotation: Rest der alten Datei lesen, dann die neue von vorn
+            old_lines, _ = self._read()
+            lines.extend(old_lines)
+            if self._partial:
+                lines.append(self._decode(self._partial))
+            self._file.close()
+            self.rotations += 1
+            if not self._open(offset=0):
+                return lines, False
+        elif stat is None:
+            # Gelöscht, aber noch offen: Rest lesen, beim nächsten Mal neu öffnen
+            old_lines, _ = self._read()
+            self._file.close()
+            self._file = None
+            return old_lines, False
+        elif os.fstat(self._file.fileno()).st_size < self.position:
+            # Truncation (z.B. copytruncate) -> von vorn lesen
+            self.truncations += 1
+            self._file.seek(0)
+            self.position = 0
+            self._partial = b''
+            lines.append("✂️ --- file truncated ---")
+
+        new_lines, more = self._read()
+        lines.extend(new_lines)
+        return lines, more
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class ByteBudget:
+    """Erlaubt max. limit Bytes pro window Sekunden; zählt, was verworfen wurde"""
+
+    def __init__(self, limit, window=60.0):
+        self.limit = limit
+        self.window = window
+        self.window_start = time.monotonic()
+        self.used = 0
+        self.dropped_lines = 0
+        self.dropped_bytes = 0
+
+    def take(self, size):
+        now = time.monotonic()
+        if now - self.window_start >= self.window:
+            self.window_start = now
+            self.used = 0
+        if self.used + size > self.limit:
+            self.dropped_lines += 1
+            self.dropped_bytes += size
+            return False
+        self.used += size
+        return True
+
+    def pop_dropped(self):
+        """Meldung über verworfene Zeilen seit dem letzten Aufruf (oder None)"""
+        if not self.dropped_lines:
+            return None
+        note = f"⚠️ {self.dropped_lines} Zeilen ({self.dropped_bytes} Bytes) übersprungen (Budget {self.limit} Bytes/{self.window:g}s)"
+        self.dropped_lines = 0
+        self.dropped_bytes = 0
+        return note
+
+
+class Follow:
+    """Ein aktives /follow: Datei, Ziel-Chat, aktuelle Nachricht, Statistik"""
+
+    def __init__(self, follow_id, chat_id, display_path, local_path, duration, budget):
+        self.follow_id = follow_id
+        self.chat_id = chat_id
+        self.display_path = display_path
+        self.local_path = local_path
+        self.expires = time.monotonic() + duration
+        self.budget = budget
+        self.tail = TailFile(local_path)
+        self.mode = 'poll'
+        self.message_id = None
+        self.message_lines = []
+        self.pending = []
+        self.lines_sent = 0
+        self.messages = 0
+        self.changed = asyncio.Event()
+        self.task = None
+        self.active = True
+        self.stop_reason = 'stopped'
+
+
+class FollowManager:
+    """
+    Verwaltet alle /follow Sessions.
+    publisher(follow, text, message_id, reason) sendet (message_id None) bzw. editiert eine Nachricht
+    und gibt deren message_id zurück; None = Nachricht existiert nicht mehr -> Follow beenden.
+    """
+
+    def __init__(self, publisher, flush_interval=3.0, budget_bytes=16384, budget_window=60.0,
+                 max_follows=5, poll_interval=1.0, max_poll_interval=5.0, recheck_interval=30.0):
+        self.publisher = publisher
+        self.flush_interval = flush_interval
+        self.budget_bytes = budget_bytes
+        self.budget_window = budget_window
+        self.max_follows = max_follows
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.recheck_interval = recheck_interval
+        self._follows = {}
+        self._ids = itertools.count(1)
+        self._dispatcher = None
+        self._dispatcher_checked = False
+
+    def __len__(self):
+        return len(self._follows)
+
+    def follows_for_chat(self, chat_id):
+        return [f for f in self._follows.values() if f.chat_id == chat_id]
+
+    def _get_dispatcher(self):
+        if not self._dispatcher_checked:
+            self._dispatcher_checked = True
+            self._dispatcher = InotifyDispatcher.create(asyncio.get_running_loop())
+        return self._dispatcher
+
+    async def start(self, chat_id, display_path, local_path, duration, initial_lines=10):
+        """Startet ein Follow (sendet die letzten Zeilen sofort); None wenn das Limit erreicht ist"""
+        if len(self._follows) >= self.max_follows:
+            return None
+        follow = Follow(next(self._ids), chat_id, display_path, local_path, duration,
+                        ByteBudget(self.budget_bytes, self.budget_window))
+        follow.pending.extend(follow.tail.open(initial_lines))
+
+        token = None
+        dispatcher = self._get_dispatcher()
+        if dispatcher:
+            try:
+                token = dispatcher.subscribe(local_path, follow.changed.set)
+                follow.mode = 'inotify'
+            except OSError as e:
+                logger.warning(f"⚠️  inotify watch for {display_path} failed ({e}), polling instead")
+
+        self._follows[follow.follow_id] = follow
+        follow.task = asyncio.get_running_loop().create_task(self._run(follow, token))
+        logger.info(f"📜 Follow #{follow.follow_id} started: {display_path} ({follow.mode}) in chat {chat_id}")
+        return follow
+
+    async def stop(self, follow_id, reason='stopped'):
+        follow = self._follows.get(follow_id)
+        if follow is None:
+            return False
+        follow.active = False
+        follow.stop_reason = reason
+        follow.changed.set()
+        if follow.task and follow.task is not asyncio.current_task():
+            await follow.task
+        return True
+
+    async def shutdown(self):
+        for follow_id in list(self._follows):
+            await self.stop(follow_id, 'shutdown')
+        if self._dispatcher:
+            self._dispatcher.close()
+            self._dispatcher = None
+            self._dispatcher_checked = False
+
+    async def _wait_for_change(self, follow, timeout, idle_polls):
+        """inotify: auf Event warten; Polling: Intervall wächst, solange nichts passiert"""
+        if follow.mode == 'inotify':
+            timeout = self.recheck_interval if timeout is None else min(timeout, self.recheck_interval)
+        else:
+            poll = min(self.max_poll_interval, self.poll_interval * (1.5 ** idle_polls))
+            timeout = poll if timeout is None else min(timeout, poll)
+        try:
+            await asyncio.wait_for(follow.changed.wait(), max(0.0, timeout))
+        except asyncio.TimeoutError:
+            pass
+        follow.changed.clear()
+
+    async def _run(self, follow, token):
+        reason = 'stopped'
+        last_flush = 0.0
+        idle_polls = 0
+        try:
+            while follow.active:
+                now = time.monotonic()
+                if now >= follow.expires:
+                    reason = 'expired'
+                    break
+                lines, more = await asyncio.to_thread(follow.tail.read_new)
+                idle_polls = 0 if lines else idle_polls + 1
+                for line in lines:
+                    if follow.budget.take(len(line.encode('utf-8', errors='replace')) + 1):
+                        follow.pending.append(line)
+
+                if follow.pending or follow.budget.dropped_lines:
+                    if now - last_flush >= self.flush_interval:
+                        if not await self._flush(follow, None):
+                            reason = 'message gone'
+                            break
+                        last_flush = now
+                        timeout = None
+                    else:
+                        timeout = self.flush_interval - (now - last_flush)
+                else:
+                    timeout = None
+                if more:
+                    await asyncio.sleep(0)  # Rest ohne Warten lesen, aber Event Loop nicht blockieren
+                    continue
+                await self._wait_for_change(follow, min(timeout or follow.expires - now, follow.expires - now), idle_polls)
+            if not follow.active:
+                reason = follow.stop_reason
+        except Exception as e:
+            reason = f'error: {e}'
+            logger.error(f"❌ Follow #{follow.follow_id} failed: {e}", exc_info=True)
+        finally:
+            self._follows.pop(follow.follow_id, None)
+            if token and self._dispatcher:
+                self._dispatcher.unsubscribe(token)
+            follow.tail.close()
+            if reason != 'message gone':
+                try:
+                    await self._flush(follow, reason)
+                except Exception as e:
+                    logger.warning(f"⚠️  Final update for follow #{follow.follow_id} failed: {e}")
+            logger.info(f"⏹️  Follow #{follow.follow_id} {reason}: {follow.lines_sent} lines, {follow.messages} messages, "
+                        f"{follow.tail.rotations} rotations, {follow.tail.truncations} truncations")
+
+    def _header(self, follow, reason):
+        if reason:
+            return f"⏹️ Follow beendet: {follow.display_path} ({reason})"
+        return f"📜 {follow.display_path} ({follow.mode})"
+
+    async def _flush(self, follow, reason):
+        """Hängt gesammelte Zeilen an die aktuelle Nachricht an; neue Nachricht, wenn sie voll ist"""
+        note = follow.budget.pop_dropped()
+        if note:
+            follow.pending.append(note)
+        pending, follow.pending = follow.pending, []
+        header = self._header(follow, reason)
+
+        dirty = False
+        size = len(header) + sum(len(line) + 1 for line in follow.message_lines)
+        for line in pending:
+            if follow.message_lines and size + len(line) + 1 > MAX_MESSAGE_CHARS:
+                # Aktuelle Nachricht ist voll -> zustellen und eine neue beginnen
+                if dirty and not await self._publish(follow, header, None):
+                    return False
+                follow.message_id = None
+                follow.message_lines = []
+                size = len(header)
+            follow.message_lines.append(line)
+            follow.lines_sent += 1
+            size += len(line) + 1
+            dirty = True
+
+        if dirty or reason:
+            return await self._publish(follow, header, reason)
+        return True
+
+    async def _publish(self, follow, header, reason):
+        body = '\n'.join(follow.message_lines) if follow.message_lines else "(keine neuen Zeilen)"
+        is_new = follow.message_id is None
+        message_id = await self.publisher(follow, f"{header}\n\n{body}", follow.message_id, reason)
+        if message_id is None:
+            return False
+        if is_new:
+            follow.messages += 1
+        follow.message_id = message_id
+        return True
@@ -0,0 +1,249 @@
+"""
+Health Report: alle Collectors parallel ausführen und zu einer kompakten Übersicht zusammenfassen
+- Globale Deadline: langsame Collectors erscheinen als "timeout", der Rest wird trotzdem angezeigt
+- Pro Eintrag ein Status (ok / warn / crit / unknown) und eine einzeilige Zusammenfassung
+- Gesamtstatus = schlechtester Einzelstatus
+"""
+import re
+import time
+import asyncio
+
+STATUS_ORDER = {'ok': 0, 'unknown': 1, 'warn': 2, 'crit': 3}
+STATUS_ICONS = {'ok': '✅', 'warn': '⚠️', 'crit': '🔥', 'unknown': '❔'}
+TITLES = {
+    'host_info': 'Host',
+    'system_info': 'System',
+    'memory': 'Memory',
+    'disk_space': 'Disk',
+    'uptime': 'Uptime',
+    'processes': 'Processes',
+    'temp': 'Temperature',
+    'bot_logs': 'Bot Logs',
+    'pressure': 'Pressure',
+    'cgroups': 'Services',
+    'disk_io': 'Disk I/O',
+    'network': 'Network',
+}
+
+# Schwellwerte (Prozent bzw. PSI some avg10)
+DISK_WARN, DISK_CRIT = 80.0, 90.0
+MEMORY_WARN, MEMORY_CRIT = 85.0, 95.0
+PSI_WARN, PSI_CRIT = 10.0, 25.0
+TEMP_WARN, TEMP_CRIT = 75.0, 90.0  # nur wenn der Sensor keine eigenen Grenzwerte hat
+
+SIZE_RE = re.compile(r'^(\d+(?:[.,]\d+)?)([KMGTP]?)i?B?$', re.IGNORECASE)
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4, 'P': 1024 ** 5}
+
+
+def level(value, warn, crit):
+    if value >= crit:
+        return 'crit'
+    if value >= warn:
+        return 'warn'
+    return 'ok'
+
+
+def worst(statuses):
+    return max(statuses, key=lambda s: STATUS_ORDER[s], default='unknown')
+
+
+def parse_size(text):
+    """'15Gi', '7.1G', '512M', '1024' -> Bytes (None wenn nicht parsebar)"""
+    match = SIZE_RE.match(text.strip())
+    if not match:
+        return None
+    return float(match.group(1).replace(',', '.')) * SIZE_UNITS[match.group(2).upper()]
+
+
+def parse_memory(output):
+    """(total, available) in Bytes aus `free`, /proc/meminfo oder wmic (Windows) Ausgabe"""
+    values = {}
+    for line in output.splitlines():
+        fields = line.split()
+        if fields and fields[0] == 'Mem:' and len(fields) >= 7:
+            # free: total used free shared buff/cache available
+            return parse_size(fields[1]), parse_size(fields[6])
+        key, sep, value = line.partition(':') if ':' in line else line.partition('=')
+        if sep:
+            values[key.strip()] = value.strip()
+    if 'MemTotal' in values and 'MemAvailable' in values:
+        return parse_size(values['MemTotal'].replace(' kB', 'K')), parse_size(values['MemAvailable'].replace(' kB', 'K'))
+    if 'TotalVisibleMemorySize' in values and 'FreePhysicalMemory' in values:
+        return float(values['TotalVisibleMemorySize']) * 1024, float(values['FreePhysicalMemory']) * 1024
+    return None, None
+
+
+def format_size(value):
+    for unit in ('', 'K', 'M', 'G', 'T'):
+        if value < 1024 or unit == 'T':
+            return f"{value:.1f}{unit}" if unit else f"{value:.0f}"
+        value /= 1024
+
+
+def first_line(output, limit=80):
+    for line in output.splitlines():
+        line = line.strip()
+        if line and not line.startswith('==='):
+            return line[:limit]
+    return '-'
+
+
+def summarize_memory(output, data):
+    total, available = parse_memory(output)
+    if not total or available is None:
+        return 'unknown', first_line(output), {}
+    used_percent = round((total - available) / total * 100, 1)
+    return (
+        level(used_percent, MEMORY_WARN, MEMORY_CRIT),
+        f"{used_percent:.0f}% used ({format_size(total - available)} / {format_size(total)})",
+        {'percent': used_percent},
+    )
+
+
+def summarize_disk(output, data):
+    disks = (data or {}).get('disks') or []
+    if not disks:
+        return 'unknown', first_line(output), {}
+    fullest = max(disks, key=lambda d: d['use_percent'])
+    status = level(fullest['use_percent'], DISK_WARN, DISK_CRIT)
+    summary = f"{fullest['mounted_on']} {fullest['use_percent']:.0f}% used"
+    if len(disks) > 1:
+        summary += f" (fullest of {len(disks)})"
+    if (data or {}).get('stale_mounts'):
+        status = worst([status, 'warn'])
+        summary += f", {len(data['stale_mounts'])} not responding"
+    return status, summary, {'percent': fullest['use_percent']}
+
+
+def summarize_temp(output, data):
+    sensors = (data or {}).get('sensors')
+    if not sensors:
+        return 'unknown', first_line(output), {}
+    statuses = []
+    for sensor in sensors:
+        warn = sensor.get('high') or TEMP_WARN
+        crit = sensor.get('critical') or max(warn + 10, TEMP_CRIT)
+        statuses.append(level(sensor['celsius'], warn, crit))
+    hottest = max(sensors, key=lambda s: s['celsius'])
+    return worst(statuses), f"max {hottest['celsius']:.1f}°C ({hottest['chip']} {hottest['label']})", \
+        {'celsius': hottest['celsius']}
+
+
+def summarize_pressure(output, data):
+    resources = (data or {}).get('resources')
+    if not resources:
+        return 'unknown', 'PSI not available', {}
+    values = {name: kinds.get('some', {}).get('avg10', 0.0) for name, kinds in resources.items()}
+    name, value = max(values.items(), key=lambda item: item[1])
+    return level(value, PSI_WARN, PSI_CRIT), ', '.join(f"{n} {v:.1f}%" for n, v in values.items()), \
+        {'percent': value}
+
+
+def summarize_processes(output, data):
+    lines = [line for line in output.splitlines() if line.strip()]
+    if len(lines) >= 2 and lines[0].split()[:3] == ['USER', 'PID', '%CPU']:
+        fields = lines[1].split(None, 10)
+        if len(fields) >= 11:
+            return 'ok', f"{len(lines) - 1} shown, top: {fields[10][:40]} ({fields[2]}% CPU)", {}
+    return 'ok', first_line(output), {}
+
+
+def summarize_logs(output, data):
+    lines = output.splitlines()
+    errors = sum(1 for line in lines if '| ERROR' in line or '| CRITICAL' in line)
+    warnings = sum(1 for line in lines if '| WARNING' in line)
+    if errors:
+        return 'warn', f"{errors} errors, {warnings} warnings in the last {len(lines)} lines", {}
+    return 'ok', f"{warnings} warnings in the last {len(lines)} lines", {}
+
+
+def summarize_cgroups(output, data):
+    groups = (data or {}).get('groups')
+    if not groups:
+        return 'unknown', first_line(output), {}
+    top = groups[0]
+    return 'ok', f"top: {top['name']} {top['cpu_percent']:.1f}% CPU, {format_size(top['memory_bytes'])}", {}
+
+
+def summarize_default(output, data):
+    return 'ok', ' '.join(line.strip() for line in output.splitlines()[:2] if line.strip())[:80] or '-', {}
+
+
+SUMMARIZERS = {
+    'memory': summarize_memory,
+    'disk_space': summarize_disk,
+    'temp': summarize_temp,
+    'pressure': summarize_pressure,
+    'processes': summarize_processes,
+    'bot_logs': summarize_logs,
+    'cgroups': summarize_cgroups,
+}
+
+
+def summarize(cmd_key, result):
+    """(status, summary, metrics) für ein Command-Ergebnis"""
+    output = (result.stdout if result.stdout else result.stderr) or ''
+    if getattr(result, 'returncode', 0) not in (0, None):
+        return 'warn', first_line(output) if output.strip() else f"exit code {result.returncode}", {}
+    summarizer = SUMMARIZERS.get(cmd_key, summarize_default)
+    try:
+        return summarizer(output, getattr(result, 'data', None))
+    except (KeyError, ValueError, TypeError, IndexError, ZeroDivisionError):
+        return 'unknown', first_line(output), {}
+
+
+async def collect_health(run, cmd_keys, deadline, extra_items=()):
+    """
+    Führt run(cmd_key) für alle Keys parallel aus und wartet höchstens deadline Sekunden.
+    extra_items: fertige Einträge (z.B. Zustand des Bot-Prozesses), die mit bewertet werden.
+    Liefert den strukturierten Report (eine Nutzlast für Telegram und die Mini App).
+    """
+    started = time.monotonic()
+    tasks = {}
+    finished = {}
+
+    async def timed(cmd_key):
+        result = await run(cmd_key)
+        finished[cmd_key] = round((time.monotonic() - started) * 1000)
+        return result
+
+    for cmd_key in cmd_keys:
+        tasks[asyncio.ensure_future(timed(cmd_key))] = cmd_key
+    done, pending = await asyncio.wait(tasks, timeout=deadline) if tasks else (set(), set())
+    for task in pending:
+        task.cancel()  # Executor-Threads laufen ggf. weiter, das Ergebnis wird verworfen
+
+    items = []
+    for task, cmd_key in tasks.items():
+        item = {'key': cmd_key, 'title': TITLES.get(cmd_key, cmd_key), 'elapsed_ms': finished.get(cmd_key)}
+        if task in pending:
+            item.update(status='unknown', summary=f"timeout (>{deadline:g}s)")
+        elif task.exception() is not None:
+            item.update(status='unknown', summary=f"error: {str(task.exception())[:60]}")
+        else:
+            status, summary, metrics = summarize(cmd_key, task.result())
+            item.update(status=status, summary=summary, **metrics)
+        items.append(item)
+    items.extend(extra_items)
+
+    return {
+        'type': 'health',
+        'status': worst(item['status'] for item in items),
+        'duration_ms': round((time.monotonic() - started) * 1000),
+        'deadline_s': deadline,
+        'complete': not pending,
+        'items': items,
+    }
+
+
+def format_health(report):
+    """Kompakte Text-Übersicht für Telegram"""
+    answered = sum(1 for item in report['items'] if item['elapsed_ms'] is not None)
+    lines = [
+        f"🩺 Health: {STATUS_ICONS[report['status']]} {report['status'].upper()} "
+        f"({answered}/{len(report['items'])} in {report['duration_ms'] / 1000:.1f}s)",
+        "",
+    ]
+    for item in report['items']:
+        lines.append(f"{STATUS_ICONS[item['status']]} {item['title']}: {item['summary']}")
+    return '\n'.join(lines)
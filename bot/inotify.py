@@ -0,0 +1,159 @@
+"""
+Minimales inotify Binding (ctypes, nur Linux) für asyncio
+Ein Dispatcher pro Event Loop überwacht Verzeichnisse (Refcount pro Verzeichnis) und
+benachrichtigt Subscriber, sobald sich eine Datei mit ihrem Namen ändert.
+Verzeichnis statt Datei: so werden auch Rotation (rename + neu anlegen) und Löschen erkannt.
+"""
+import os
+import errno
+import ctypes
+import ctypes.util
+import logging
+import struct
+
+logger = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Alles, was für "neue Daten / Datei ersetzt / Datei weg" relevant ist
+FOLLOW_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | \
+    IN_DELETE_SELF | IN_MOVE_SELF
+
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def parse_events(buffer):
+    """Zerlegt den gelesenen Buffer in (wd, mask, name) Tupel"""
+    events = []
+    offset = 0
+    while offset + EVENT_HEADER.size <= len(buffer):
+        wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+        offset += EVENT_HEADER.size
+        name = buffer[offset:offset + length].rstrip(b'\0').decode('utf-8', errors='surrogateescape')
+        offset += length
+        events.append((wd, mask, name))
+    return events
+
+
+class Inotify:
+    """Dünner Wrapper um inotify_init1 / inotify_add_watch / inotify_rm_watch"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+    def add_watch(self, path, mask):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), path)
+        return wd
+
+    def rm_watch(self, wd):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self):
+        events = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+            events.extend(parse_events(buffer))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class InotifyDispatcher:
+    """Verteilt inotify Events über den Event Loop (add_reader, kein Polling)"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.inotify = Inotify()
+        # Verzeichnis -> wd, wd -> {'path', 'subscribers': {token: (name, callback)}}
+        self._dirs = {}
+        self._watches = {}
+        self._tokens = 0
+        loop.add_reader(self.inotify.fd, self._on_readable)
+
+    @classmethod
+    def create(cls, loop):
+        """Dispatcher oder None, wenn inotify nicht verfügbar ist (kein Linux, Limits erreicht, ...)"""
+        if not hasattr(os, 'fsencode') or os.name != 'posix':
+            return None
+        try:
+            return cls(loop)
+        except (OSError, AttributeError, NotImplementedError) as e:
+            logger.warning(f"⚠️  inotify not available ({e}), falling back to polling")
+            return None
+
+    def subscribe(self, path, callback):
+        """callback() wird bei Änderungen an path (bzw. dessen Verzeichnis-Eintrag) aufgerufen"""
+        directory, name = os.path.split(os.path.abspath(path))
+        wd = self._dirs.get(directory)
+        if wd is None:
+            wd = self.inotify.add_watch(directory, FOLLOW_MASK)
+            self._dirs[directory] = wd
+            self._watches[wd] = {'path': directory, 'subscribers': {}}
+        self._tokens += 1
+        self._watches[wd]['subscribers'][self._tokens] = (name, callback)
+        return (wd, self._tokens)
+
+    def unsubscribe(self, token):
+        wd, key = token
+        watch = self._watches.get(wd)
+        if not watch:
+            return
+        watch['subscribers'].pop(key, None)
+        if not watch['subscribers']:
+            del self._watches[wd]
+            self._dirs.pop(watch['path'], None)
+            try:
+                self.inotify.rm_watch(wd)
+            except OSError as e:
+                if e.errno != errno.EINVAL:
+                    raise
+
+    def _on_readable(self):
+        for wd, mask, name in self.inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                # Events verloren -> alle Subscriber prüfen lassen
+                for watch in self._watches.values():
+                    for _, callback in watch['subscribers'].values():
+                        callback()
+                continue
+            watch = self._watches.get(wd)
+            if not watch:
+                continue
+            for sub_name, callback in list(watch['subscribers'].values()):
+                # Events am Verzeichnis selbst (name leer) betreffen alle Subscriber
+                if not name or name == sub_name:
+                    callback()
+
+    def close(self):
+        self.loop.remove_reader(self.inotify.fd)
+        self.inotify.close()
+        self._dirs.clear()
+        self._watches.clear()
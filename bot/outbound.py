@@ -0,0 +1,148 @@
+"""
+Outbound-Schicht für die Telegram Bot API
+- HTTPXRequest mit Keep-Alive Connection Pool (optional HTTP/2)
+- Rate Limiter pro Chat (Token Bucket) mit Retry/Backoff bei 429 (retry_after)
+- Status-Nachricht nur senden, wenn ein Command länger dauert
+"""
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+from telegram.request import HTTPXRequest
+
+logger = logging.getLogger(__name__)
+
+
+def build_request(pool_size, http_version='1.1', connect_timeout=5.0, read_timeout=5.0,
+                  write_timeout=5.0, pool_timeout=1.0, keepalive_expiry=30.0):
+    """Erstellt einen HTTPXRequest mit fester Pool-Größe und langlebigen Keep-Alive Verbindungen"""
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=keepalive_expiry,
+    )
+    kwargs = dict(
+        connection_pool_size=pool_size,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        write_timeout=write_timeout,
+        pool_timeout=pool_timeout,
+        httpx_kwargs={'limits': limits},
+    )
+    try:
+        return HTTPXRequest(http_version=http_version, **kwargs)
+    except RuntimeError as e:
+        # HTTP/2 braucht das optionale h2 Paket (python-telegram-bot[http2])
+        if http_version == '1.1':
+            raise
+        logger.warning(f"⚠️  HTTP/{http_version} not available ({e}), falling back to HTTP/1.1")
+        return HTTPXRequest(http_version='1.1', **kwargs)
+
+
+class TokenBucket:
+    """Einfacher Token Bucket (rate Tokens/Sekunde, max. capacity Tokens Burst)"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self):
+        """Reserviert ein Token und gibt die nötige Wartezeit (Sekunden) zurück"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def block(self, seconds):
+        """Sperrt den Bucket (z.B. nach retry_after von Telegram)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class ChatRateLimiter(BaseRateLimiter):
+    """
+    Rate Limiter nach den Telegram-Limits:
+    ~30 Nachrichten/s insgesamt, ~1/s pro privatem Chat (kurze Bursts erlaubt), 20/min pro Gruppe.
+    Bei 429 wird retry_after (mit Backoff) abgewartet und erneut gesendet.
+    """
+
+    def __init__(self, overall_rate=30.0, chat_rate=1.0, chat_burst=3, group_rate=20 / 60.0,
+                 group_burst=5, max_retries=3, backoff_base=0.5, max_chats=1024):
+        self.overall = TokenBucket(overall_rate, overall_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.group_burst = group_burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_chats = max_chats
+        self._chats = {}
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        self._chats.clear()
+
+    def _chat_bucket(self, chat_id):
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= self.max_chats:
+                # Älteste Einträge verwerfen (dict behält Einfüge-Reihenfolge)
+                for key in list(self._chats)[:len(self._chats) // 2]:
+                    del self._chats[key]
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            bucket = TokenBucket(self.group_rate, self.group_burst) if is_group else TokenBucket(self.chat_rate, self.chat_burst)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        chat_id = data.get('chat_id')
+        # Nur Nachrichten mit Chat-Bezug drosseln (answerCallbackQuery etc. sollen sofort raus)
+        bucket = self._chat_bucket(chat_id) if chat_id is not None else None
+
+        attempt = 0
+        while True:
+            wait = self.overall.reserve()
+            if bucket:
+                wait = max(wait, bucket.reserve())
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt >= self.max_retries:
+                    raise
+                retry_after = e.retry_after
+                if hasattr(retry_after, 'total_seconds'):
+                    retry_after = retry_after.total_seconds()
+                delay = max(float(retry_after), self.backoff_base * (2 ** attempt)) + random.uniform(0, 0.1)
+                attempt += 1
+                logger.warning(f"⏳ Flood limit on {endpoint} (chat {chat_id}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                (bucket or self.overall).block(delay)
+
+
+async def run_with_status(coro, send_status, delay):
+    """
+    Führt coro aus und ruft send_status() nur auf, wenn coro nach delay Sekunden noch läuft.
+    Schnelle Commands brauchen so nur eine Nachricht statt Status + Ergebnis.
+    Gibt (Ergebnis, Status-Nachricht oder None) zurück.
+    """
+    task = asyncio.ensure_future(coro)
+    done, _ = await asyncio.wait({task}, timeout=delay)
+    status = None
+    if not done:
+        try:
+            status = await send_status()
+        except Exception as e:
+            logger.warning(f"⚠️  Could not send status message: {e}")
+    return await task, status
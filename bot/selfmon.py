@@ -0,0 +1,259 @@
+"""
+Selbstüberwachung des Bot-Prozesses
+- RSS (aktuell + Peak), offene FDs und Threads aus /proc/self
+- Event-Loop-Lag über einen Heartbeat (Soll- vs. Ist-Zeitpunkt eines sleep)
+- Auslastung des Thread Pools über einen In-Flight-Zähler (CountingExecutor)
+- Optional tracemalloc: Top-Allokationen als Differenz zum vorherigen Snapshot
+- Soft Limits: neue Commands ablehnen (Load Shedding), Hard Limit: geordnet beenden (Neustart durch Docker)
+"""
+import os
+import gc
+import time
+import asyncio
+import logging
+import threading
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class Overloaded(RuntimeError):
+    """Neuer Command abgelehnt, weil ein Soft Limit überschritten ist"""
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor, der laufende + wartende Aufgaben zählt"""
+
+    def __init__(self, max_workers=None, **kwargs):
+        super().__init__(max_workers=max_workers, **kwargs)
+        self.in_flight = 0
+        self._count_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._count_lock:
+            self.in_flight += 1
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except Exception:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _):
+        with self._count_lock:
+            self.in_flight -= 1
+
+    @property
+    def queued(self):
+        """Aufgaben, die auf einen freien Thread warten"""
+        return max(0, self.in_flight - self._max_workers)
+
+
+def read_process_status(pid='self'):
+    """VmRSS, VmHWM (Peak) in Bytes und Threads aus /proc/<pid>/status (leer wenn nicht verfügbar)"""
+    values = {}
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('VmRSS', 'VmHWM'):
+                    values[key] = int(value.split()[0]) * 1024
+                elif key == 'Threads':
+                    values[key] = int(value)
+    except (OSError, ValueError, IndexError):
+        pass
+    return values
+
+
+def count_fds(pid='self'):
+    try:
+        return len(os.listdir(f'/proc/{pid}/fd'))
+    except OSError:
+        return None
+
+
+class SelfMonitor:
+    """
+    Heartbeat-Task im Event Loop, der Prozess-Metriken sammelt und Limits prüft.
+    in_flight_sources: {name: callable -> int} für zusätzliche Warteschlangen (z.B. Executor-Prozess).
+    on_hard_limit(reason) wird einmalig aufgerufen, wenn ein Hard Limit überschritten ist.
+    """
+
+    def __init__(self, executor=None, interval=1.0, rss_soft_bytes=0, rss_hard_bytes=0, lag_soft_ms=0,
+                 queue_soft=0, on_hard_limit=None, tracemalloc_frames=0, in_flight_sources=None):
+        self.executor = executor
+        self.interval = interval
+        self.rss_soft_bytes = rss_soft_bytes
+        self.rss_hard_bytes = rss_hard_bytes
+        self.lag_soft_ms = lag_soft_ms
+        self.queue_soft = queue_soft
+        self.on_hard_limit = on_hard_limit
+        self.in_flight_sources = in_flight_sources or {}
+        self.started = time.time()
+        self.lags = deque(maxlen=max(1, int(60 / interval)))  # Lag der letzten Minute (ms)
+        self.status = {}
+        self.fds = None
+        self.shedding = None
+        self.shed_count = 0
+        self.hard_limit_hit = False
+        self._task = None
+        self._tracemalloc_snapshot = None
+        if tracemalloc_frames:
+            tracemalloc.start(tracemalloc_frames)
+            self._tracemalloc_snapshot = tracemalloc.take_snapshot()
+            logger.info(f"🔬 tracemalloc enabled ({tracemalloc_frames} frames)")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        return self._task
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            # Verspätung des Wakeups = wie lange der Loop blockiert war
+            self.lags.append(max(0.0, time.monotonic() - expected) * 1000)
+            self.sample()
+            self._check_limits()
+
+    def sample(self):
+        self.status = read_process_status()
+        self.fds = count_fds()
+
+    @property
+    def rss(self):
+        return self.status.get('VmRSS')
+
+    def recent_lag_ms(self, samples=5):
+        """Maximaler Lag der letzten paar Heartbeats (einzelne Ausreißer zählen nicht lange)"""
+        recent = list(self.lags)[-samples:]
+        return max(recent) if recent else 0.0
+
+    def executor_queued(self):
+        return self.executor.queued if isinstance(self.executor, CountingExecutor) else 0
+
+    def _check_limits(self):
+        rss = self.rss or 0
+        if self.rss_hard_bytes and rss > self.rss_hard_bytes and not self.hard_limit_hit:
+            self.hard_limit_hit = True
+            reason = f"RSS {rss / MB:.0f} MB > hard limit {self.rss_hard_bytes / MB:.0f} MB"
+            logger.critical(f"🚨 {reason}, restarting gracefully")
+            if self.on_hard_limit:
+                self.on_hard_limit(reason)
+            return
+
+        reasons = []
+        # Hysterese: erst unter 90% des Limits wieder annehmen
+        factor = 0.9 if self.shedding else 1.0
+        if self.rss_soft_bytes and rss > self.rss_soft_bytes * factor:
+            reasons.append(f"RSS {rss / MB:.0f} MB > {self.rss_soft_bytes / MB:.0f} MB")
+        if self.lag_soft_ms and self.recent_lag_ms() > self.lag_soft_ms * factor:
+            reasons.append(f"loop lag {self.recent_lag_ms():.0f} ms > {self.lag_soft_ms:g} ms")
+        if self.queue_soft and self.executor_queued() > self.queue_soft * factor:
+            reasons.append(f"executor queue {self.executor_queued()} > {self.queue_soft}")
+
+        reason = ', '.join(reasons) or None
+        if reason and not self.shedding:
+            logger.warning(f"⚠️  Soft limit exceeded ({reason}), rejecting new commands")
+            if self.rss_soft_bytes and rss > self.rss_soft_bytes:
+                gc.collect()
+        elif self.shedding and not reason:
+            logger.info("✅ Back below soft limits, accepting commands again")
+        self.shedding = reason
+
+    def overloaded(self):
+        """Grund, warum neue Commands abgelehnt werden sollen (None = alles ok)"""
+        if self.shedding or self.hard_limit_hit:
+            self.shed_count += 1
+            return self.shedding or 'restarting'
+        return None
+
+    def snapshot(self):
+        if not self.status:
+            self.sample()
+        return {
+            'pid': os.getpid(),
+            'uptime_s': round(time.time() - self.started),
+            'rss_bytes': self.status.get('VmRSS'),
+            'rss_peak_bytes': self.status.get('VmHWM'),
+            'threads': self.status.get('Threads', threading.active_count()),
+            'fds': self.fds,
+            'loop_lag_ms': round(self.lags[-1], 1) if self.lags else None,
+            'loop_lag_max_ms': round(max(self.lags), 1) if self.lags else None,
+            'executor_in_flight': getattr(self.executor, 'in_flight', None),
+            'executor_queued': self.executor_queued(),
+            'in_flight': {name: source() for name, source in self.in_flight_sources.items()},
+            'gc_counts': list(gc.get_count()),
+            'shedding': self.shedding,
+            'shed_count': self.shed_count,
+        }
+
+    def tracemalloc_diff(self, limit=10):
+        """Top-Allokationen seit dem letzten Aufruf (None wenn tracemalloc aus ist); langsam -> Executor"""
+        if self._tracemalloc_snapshot is None:
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        stats = snapshot.compare_to(self._tracemalloc_snapshot, 'lineno')
+        self._tracemalloc_snapshot = snapshot
+        return [
+            f"{stat.size_diff / 1024:+.1f} KB ({stat.count_diff:+d}) {stat.traceback[0].filename.rsplit(os.sep, 1)[-1]}:"
+            f"{stat.traceback[0].lineno}"
+            for stat in stats[:limit]
+        ]
+
+    def health_item(self):
+        """Eintrag für den /health Report"""
+        stats = self.snapshot()
+        status = 'crit' if self.hard_limit_hit else 'warn' if self.shedding else 'ok'
+        parts = []
+        if stats['rss_bytes'] is not None:
+            parts.append(f"RSS {stats['rss_bytes'] / MB:.0f} MB")
+        if stats['fds'] is not None:
+            parts.append(f"{stats['fds']} FDs")
+        if stats['loop_lag_max_ms'] is not None:
+            parts.append(f"lag max {stats['loop_lag_max_ms']:.0f} ms")
+        parts.append(f"queue {stats['executor_queued']}")
+        item = {'key': 'bot', 'title': 'Bot', 'elapsed_ms': 0, 'status': status, 'summary': ', '.join(parts)}
+        if self.rss_soft_bytes and stats['rss_bytes'] is not None:
+            item['percent'] = round(stats['rss_bytes'] / self.rss_soft_bytes * 100, 1)
+        return item
+
+
+def format_bytes(value):
+    return '-' if value is None else f"{value / MB:.1f} MB"
+
+
+def format_selfstats(stats, allocations=None):
+    """Text für /selfstats"""
+    lines = [
+        f"🤖 Bot process (PID {stats['pid']}, up {stats['uptime_s'] // 3600}h {stats['uptime_s'] % 3600 // 60}m)",
+        "",
+        f"RSS:        {format_bytes(stats['rss_bytes'])} (peak {format_bytes(stats['rss_peak_bytes'])})",
+        f"FDs:        {stats['fds'] if stats['fds'] is not None else '-'}",
+        f"Threads:    {stats['threads']}",
+        f"Loop lag:   {stats['loop_lag_ms'] if stats['loop_lag_ms'] is not None else '-'} ms "
+        f"(max 1 min: {stats['loop_lag_max_ms'] if stats['loop_lag_max_ms'] is not None else '-'} ms)",
+        f"Executor:   {stats['executor_in_flight']} in flight, {stats['executor_queued']} queued",
+    ]
+    for name, value in stats['in_flight'].items():
+        lines.append(f"{name + ':':<12}{value} in flight")
+    lines.append(f"GC counts:  {stats['gc_counts']}")
+    lines.append(f"Shedding:   {stats['shedding'] or 'no'} ({stats['shed_count']} rejected)")
+    if allocations is not None:
+        lines += ["", "Top allocations since last call:"] + (allocations or ["(no change)"])
+    return '\n'.join(lines)
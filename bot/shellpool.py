@@ -0,0 +1,284 @@
+"""
+Pool aus langlebigen /bin/sh Workern für Shell-Commands (nur POSIX)
+Statt pro Command eine neue Shell zu starten, bekommt ein warmer Worker den Command über stdin:
+- Jeder Job läuft per `eval` in einer Subshell -> cwd, Variablen, exports, `exit` bleiben ohne Wirkung
+  auf den Worker; Syntaxfehler im Command können das Protokoll nicht durcheinanderbringen
+- stdout/stderr jedes Jobs landen in eigenen Dateien im privaten Temp-Verzeichnis des Workers;
+  das Ende des Jobs wird über einen zufälligen Sentinel (inkl. Exit Code) auf stdout der Shell erkannt
+- Worker laufen in eigener Session mit reduzierter Umgebung und ohne Core Dumps
+- Recycling nach max_jobs Jobs oder wenn der RSS des Workers max_rss_bytes übersteigt
+- Die Pool-Größe wächst bei Last bis max_workers und schrumpft nach idle_timeout auf min_workers
+"""
+import os
+import time
+import uuid
+import shlex
+import shutil
+import signal
+import logging
+import selectors
+import tempfile
+import threading
+import subprocess
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Variablen, die an Worker weitergereicht werden (alles andere, z.B. BOT_TOKEN, nicht)
+ENV_WHITELIST = ('PATH', 'HOME', 'LANG', 'LC_ALL', 'LC_CTYPE', 'TZ', 'TERM', 'USER', 'LOGNAME', 'SHELL',
+                 'HOST_ROOT', 'DOCKER_CONTAINER')
+
+
+def worker_env():
+    env = {key: os.environ[key] for key in ENV_WHITELIST if key in os.environ}
+    env.setdefault('PATH', '/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin')
+    return env
+
+
+def read_rss(pid):
+    """Resident Set Size eines Prozesses in Bytes (0 wenn unbekannt)"""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def read_output(path):
+    """Ausgabedatei eines Jobs als Text ('' wenn nicht angelegt, z.B. cwd fehlt)"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8', errors='replace')
+    except OSError:
+        return ''
+
+
+class WorkerDied(Exception):
+    """Worker hat sich während eines Jobs beendet"""
+
+
+class ShellWorker:
+    """Ein warmer /bin/sh Prozess, der Jobs nacheinander ausführt"""
+
+    def __init__(self, shell='/bin/sh'):
+        self.tmpdir = tempfile.mkdtemp(prefix='heimdial-shell-')
+        try:
+            self.process = subprocess.Popen(
+                [shell],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=worker_env(),
+                cwd='/',
+                start_new_session=True,
+            )
+        except Exception:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+            raise
+        # Limits setzt die Shell selbst (preexec_fn ist in Prozessen mit Threads nicht sicher):
+        # keine Core Dumps, Dateien nur für den Besitzer
+        self.process.stdin.write(b'ulimit -c 0; umask 077\n')
+        self.process.stdin.flush()
+        self.jobs = 0
+        self.created = time.monotonic()
+        self.last_used = self.created
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def rss(self):
+        return read_rss(self.pid)
+
+    def run(self, cmd, cwd, timeout):
+        """Führt cmd aus; gibt (returncode, stdout, stderr) als Text zurück"""
+        sentinel = f'__HEIMDIAL_{uuid.uuid4().hex}__'
+        self.jobs += 1
+        # Eigene Ausgabedateien pro Job: Hintergrundprozesse eines Jobs (`cmd &`) schreiben später
+        # in diese Dateien statt in die Ausgabe des nächsten Jobs; stdout der Shell trägt nur den Sentinel
+        out_path = os.path.join(self.tmpdir, f'{self.jobs}.out')
+        err_path = os.path.join(self.tmpdir, f'{self.jobs}.err')
+        script = (
+            f"( cd {shlex.quote(cwd)} && eval {shlex.quote(cmd)} ) "
+            f"</dev/null >{shlex.quote(out_path)} 2>{shlex.quote(err_path)}\n"
+            f"printf '{sentinel} %d\\n' $?\n"
+        )
+        self.last_used = time.monotonic()
+        try:
+            self.process.stdin.write(script.encode('utf-8'))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerDied(str(e))
+
+        try:
+            returncode = self._wait_for_sentinel(sentinel.encode(), cmd, timeout)
+            return returncode, read_output(out_path), read_output(err_path)
+        finally:
+            for path in (out_path, err_path):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def _wait_for_sentinel(self, marker, cmd, timeout):
+        """Liest stdout der Shell bis zur Sentinel-Zeile und gibt den Exit Code daraus zurück"""
+        stream = self.process.stdout
+        buffer = bytearray()
+        deadline = time.monotonic() + timeout
+        with selectors.DefaultSelector() as selector:
+            selector.register(stream, selectors.EVENT_READ)
+            while True:
+                index = buffer.find(marker)
+                if index != -1 and buffer.find(b'\n', index) != -1:
+                    return int(buffer[index + len(marker):].split()[0])
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.kill()
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+                if not selector.select(remaining):
+                    continue
+                chunk = os.read(stream.fileno(), 65536)
+                if not chunk:
+                    raise WorkerDied('worker exited')
+                buffer.extend(chunk)
+
+    def kill(self):
+        """Beendet den Worker inkl. aller Kindprozesse (eigene Session)"""
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def close(self):
+        """Beendet den Worker sauber (stdin schließen -> Shell endet)"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self.kill()
+
+
+class ShellPool:
+    """Thread-sicherer Pool aus ShellWorkern (für den ThreadPoolExecutor)"""
+
+    def __init__(self, min_workers=1, max_workers=4, max_jobs=100, max_rss_bytes=64 * 1024 * 1024,
+                 idle_timeout=300.0, shell='/bin/sh'):
+        self.min_workers = min_workers
+        self.max_workers = max(max_workers, min_workers, 1)
+        self.max_jobs = max_jobs
+        self.max_rss_bytes = max_rss_bytes
+        self.idle_timeout = idle_timeout
+        self.shell = shell
+        self._idle = deque()
+        self._busy = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self.stats = {'jobs': 0, 'spawned': 0, 'recycled': 0, 'timeouts': 0}
+        for _ in range(min_workers):
+            self._idle.append(self._spawn())
+
+    def _spawn(self):
+        self.stats['spawned'] += 1
+        return ShellWorker(self.shell)
+
+    @property
+    def size(self):
+        with self._condition:
+            return len(self._idle) + self._busy
+
+    def _acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError('shell pool closed')
+                while self._idle:
+                    # Zuletzt benutzten Worker nehmen (LIFO) -> ältere werden idle und schrumpfen weg
+                    worker = self._idle.pop()
+                    if worker.alive():
+                        self._busy += 1
+                        return worker
+                    worker.kill()
+                if self._busy < self.max_workers:
+                    self._busy += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    raise subprocess.TimeoutExpired('shell pool', timeout)
+        # Spawn außerhalb des Locks (fork/exec dauert ein paar ms)
+        try:
+            return self._spawn()
+        except Exception:
+            with self._condition:
+                self._busy -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, worker, healthy):
+        recycle = not healthy or worker.jobs >= self.max_jobs or \
+            (self.max_rss_bytes and worker.rss() > self.max_rss_bytes)
+        if recycle:
+            self.stats['recycled'] += 1
+            worker.close() if healthy else worker.kill()
+        with self._condition:
+            self._busy -= 1
+            keep = not recycle and not self._closed
+            if keep:
+                self._idle.append(worker)
+            expired = self._pop_expired_locked()
+            self._condition.notify()
+        # Schließen dauert bis zu ein paar Sekunden -> außerhalb des Locks
+        if not recycle and not keep:
+            worker.close()  # Pool wurde während des Jobs geschlossen
+        for idle in expired:
+            idle.close()
+
+    def _pop_expired_locked(self):
+        """Entnimmt Worker, die länger als idle_timeout unbenutzt sind (bis auf min_workers)"""
+        now = time.monotonic()
+        expired = []
+        while len(self._idle) + self._busy > self.min_workers and self._idle \
+                and now - self._idle[0].last_used > self.idle_timeout:
+            expired.append(self._idle.popleft())
+        return expired
+
+    def run(self, cmd, cwd='/', timeout=30):
+        """Führt cmd in einem warmen Worker aus (Ergebnis wie subprocess.run(..., text=True))"""
+        worker = self._acquire(timeout)
+        healthy = False
+        try:
+            returncode, stdout, stderr = worker.run(cmd, cwd, timeout)
+            healthy = True
+        except subprocess.TimeoutExpired:
+            self.stats['timeouts'] += 1
+            raise
+        finally:
+            self._release(worker, healthy)
+        self.stats['jobs'] += 1
+        return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            workers = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for worker in workers:
+            worker.close()
@@ -0,0 +1,68 @@
+"""
+Update-Verarbeitung: parallel über Chats hinweg, geordnet innerhalb eines Chats
+Ein langsamer Command blockiert so keine anderen User/Chats, während Status-Edits
+und Ergebnisse eines Chats nicht durcheinander geraten.
+"""
+import asyncio
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+# Limit für den Semaphore der Basisklasse (praktisch unbegrenzt, siehe PerChatUpdateProcessor)
+UNBOUNDED = 2 ** 31
+
+
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """Max. max_concurrent_updates Updates gleichzeitig, pro Chat strikt in Eingangsreihenfolge"""
+
+    def __init__(self, max_concurrent_updates):
+        # process_update() ist in PTB final und nimmt den Semaphore der Basisklasse vor dem Chat-Lock;
+        # der ist deshalb unbegrenzt, das echte Limit gilt erst nach dem Chat-Lock (_slots)
+        super().__init__(UNBOUNDED)
+        if max_concurrent_updates < 1:
+            raise ValueError('max_concurrent_updates must be a positive integer')
+        self.running_limit = max_concurrent_updates
+        self._slots = asyncio.Semaphore(max_concurrent_updates)
+        # Chat-Key -> [Lock, Anzahl wartender/laufender Updates]
+        self._chat_locks = {}
+
+    @staticmethod
+    def chat_key(update):
+        """Chat-ID des Updates (Fallback: User-ID), None wenn nicht zuordenbar"""
+        if not isinstance(update, Update):
+            return None
+        if update.effective_chat:
+            return update.effective_chat.id
+        if update.effective_user:
+            return ('user', update.effective_user.id)
+        return None
+
+    @property
+    def active_chats(self):
+        return len(self._chat_locks)
+
+    async def do_process_update(self, update, coroutine):
+        key = self.chat_key(update)
+        if key is None:
+            async with self._slots:
+                await coroutine
+            return
+
+        # Chat-Lock vor dem Slot nehmen: wartende Updates eines Chats belegen so keine Plätze,
+        # die andere Chats nutzen könnten.
+        # asyncio.Lock weckt Wartende in FIFO-Reihenfolge -> Reihenfolge pro Chat bleibt erhalten.
+        entry = self._chat_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0], self._slots:
+                await coroutine
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._chat_locks[key]
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
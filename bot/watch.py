@@ -0,0 +1,175 @@
+"""
+Watch Mode: Commands periodisch ausführen und eine einzige Nachricht aktuell halten
+- Ein gemeinsamer Scheduler (Min-Heap nach Fälligkeit) für alle Watches statt eines Tasks pro Watch
+- Die Ausgabe wird gehasht; die Nachricht wird nur bei geänderter Ausgabe editiert
+- Automatisches Ende nach einer maximalen Laufzeit
+"""
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*(s|sec|m|min|h)?$')
+INTERVAL_UNITS = {None: 1, 's': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600}
+MESSAGE_GONE = 'message gone'
+
+
+def parse_interval(text):
+    """'10', '10s', '2m', '1h' -> Sekunden; None bei ungültiger Angabe"""
+    match = INTERVAL_RE.match(text.strip().lower())
+    if not match:
+        return None
+    return float(match.group(1)) * INTERVAL_UNITS[match.group(2)]
+
+
+def output_hash(text):
+    return hashlib.blake2b(text.encode('utf-8', errors='replace'), digest_size=16).digest()
+
+
+class Watch:
+    """Ein aktiver Watch: welcher Command, wohin (Chat/Nachricht), wie oft, wie lange"""
+
+    def __init__(self, watch_id, chat_id, message_id, cmd_key, interval, duration):
+        self.watch_id = watch_id
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.cmd_key = cmd_key
+        self.interval = interval
+        self.started = time.monotonic()
+        self.expires = self.started + duration
+        self.last_hash = None
+        self.last_output = None
+        self.last_change = None
+        self.runs = 0
+        self.edits = 0
+        self.active = True
+
+
+class WatchScheduler:
+    """
+    Führt alle Watches über einen einzigen Task aus.
+    runner(watch) -> str liefert die aktuelle Ausgabe,
+    publisher(watch, output, reason) aktualisiert die Nachricht (reason gesetzt = letzte Aktualisierung,
+    Rückgabe False = Nachricht existiert nicht mehr -> Watch beenden).
+    """
+
+    def __init__(self, runner, publisher, max_watches=10):
+        self.runner = runner
+        self.publisher = publisher
+        self.max_watches = max_watches
+        self._watches = {}
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._wakeup = None
+        self._task = None
+        self._running = set()
+
+    def __len__(self):
+        return len(self._watches)
+
+    def watches_for_chat(self, chat_id):
+        return [w for w in self._watches.values() if w.chat_id == chat_id]
+
+    def get(self, watch_id):
+        return self._watches.get(watch_id)
+
+    def add(self, chat_id, message_id, cmd_key, interval, duration):
+        """Legt einen Watch an (erste Ausführung sofort); None wenn das Limit erreicht ist"""
+        if len(self._watches) >= self.max_watches:
+            return None
+        watch = Watch(next(self._ids), chat_id, message_id, cmd_key, interval, duration)
+        self._watches[watch.watch_id] = watch
+        self._schedule(watch, time.monotonic())
+        self._ensure_task()
+        logger.info(f"👁️  Watch #{watch.watch_id} started: '{cmd_key}' every {interval:g}s in chat {chat_id}")
+        return watch
+
+    async def stop(self, watch_id, reason='stopped'):
+        """Beendet einen Watch und schreibt die letzte Ausgabe mit Hinweis"""
+        watch = self._watches.pop(watch_id, None)
+        if watch is None:
+            return False
+        watch.active = False
+        if self._wakeup:
+            self._wakeup.set()  # Scheduler-Task beendet sich, wenn kein Watch mehr aktiv ist
+        logger.info(f"⏹️  Watch #{watch_id} {reason} after {watch.runs} runs, {watch.edits} edits")
+        if reason == MESSAGE_GONE:
+            return True
+        try:
+            await self.publisher(watch, watch.last_output, reason)
+        except Exception as e:
+            logger.warning(f"⚠️  Final update for watch #{watch_id} failed: {e}")
+        return True
+
+    async def shutdown(self):
+        for watch_id in list(self._watches):
+            await self.stop(watch_id, 'shutdown')
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _schedule(self, watch, due):
+        heapq.heappush(self._heap, (due, watch.watch_id))
+        if self._wakeup:
+            self._wakeup.set()
+
+    def _ensure_task(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def _loop(self):
+        """Wartet bis zum nächsten fälligen Watch (oder bis ein früherer hinzukommt)"""
+        while self._watches:
+            now = time.monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                _, watch_id = heapq.heappop(self._heap)
+                watch = self._watches.get(watch_id)
+                if watch is None:
+                    continue  # bereits gestoppt
+                # Eigener Task: langsame Commands verzögern andere Watches nicht
+                task = asyncio.create_task(self._tick(watch))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            timeout = self._heap[0][0] - now if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._task = None
+
+    async def _tick(self, watch):
+        if time.monotonic() >= watch.expires:
+            await self.stop(watch.watch_id, 'expired')
+            return
+        try:
+            output = await self.runner(watch)
+        except Exception as e:
+            output = f"❌ Error: {e}"
+        if not watch.active:
+            return
+        watch.runs += 1
+        digest = output_hash(output)
+        if digest != watch.last_hash:
+            watch.last_hash = digest
+            watch.last_output = output
+            watch.last_change = time.time()
+            watch.edits += 1
+            try:
+                alive = await self.publisher(watch, output, None)
+            except Exception as e:
+                logger.warning(f"⚠️  Watch #{watch.watch_id} update failed: {e}")
+                alive = True
+            if alive is False:
+                await self.stop(watch.watch_id, MESSAGE_GONE)
+                return
+        # Nächste Ausführung erst nach Abschluss planen -> keine Überlappung
+        # (spätestens zum Ablauf, damit das Auto-Stop pünktlich greift)
+        if watch.active:
+            self._schedule(watch, min(time.monotonic() + watch.interval, watch.expires))